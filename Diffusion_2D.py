@@ -13,14 +13,21 @@ Date:
     November, 2022.
 
 Last Modification:
-    March, 2023.
+    October, 2026.
 """
 
 import numpy as np
 import Scripts.Gammas as Gammas
 import Scripts.Neighbors as Neighbors
+import Scripts.Schemes as Schemes
+import Scripts.Cache as Cache
+import Scripts.Profile as Profile
+import Scripts.Order as Order
 
-def Cloud(p, f, v, t, triangulation = False, tt = [], implicit = False, lam = 0.5):
+# Available precisions
+precisions = ['double', 'single']
+
+def Cloud(p, f, v, t, triangulation = False, tt = [], implicit = False, lam = 0.5, save = None, callback = None, auto = False, tf = 1, stats = None, exponential = False, tol = 1e-8, cache = False, holes = False, precision = 'double', order = None, threads = None):
     """
     2D Diffusion Equation implemented on Unstructured Clouds of Points.
     
@@ -32,7 +39,7 @@ def Cloud(p, f, v, t, triangulation = False, tt = [], implicit = False, lam = 0.
     
     Input:
         p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
-        f                           Function        Function declared with the boundary condition.
+        f                           Function        Function declared with the boundary condition, evaluated on arrays as f(x, y, t, v).
         v                           Real            Diffusion coefficient.
         t                           Integer         Number of time steps to be considered.
         triangulation               Logical         Select whether or not there is a triangulation available.
@@ -44,61 +51,49 @@ def Cloud(p, f, v, t, triangulation = False, tt = [], implicit = False, lam = 0.
                                                         False: Explicit scheme used (Default).
         lam                         Real            Lambda parameter for the implicit scheme.
                                                         Must be between 0 and 1 (Default: 0.5).
+        save                        Various         Time levels to be stored (see Schedule).
+                                                        None: All the time levels are stored (Default).
+        callback                    Function        Function called as callback(k, T[k], u) with the solution at every time level.
+        auto                        Logical         Select whether or not the number of time steps is chosen from the stability limit of the scheme.
+                                                        True: t is replaced by the smallest stable number of time steps.
+                                                        False: t is used as given (Default).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run (see Scripts.Profile).
+                                                        't', 'dt' and 'dt_max': time discretization (dt_max is None if it was not found), 'dt_method': how dt_max was found (see Schemes.Stable).
+                                                        'time': wall time of each stage ('neighbors', 'gammas', 'order', 'operator', 'steps', 'step', 'boundary', 'exact'...).
+                                                        'peak_memory': peak memory of the whole process up to the end of the run, in bytes.
+                                                        'operator': sparsity and conditioning of the operators (see Profile.Operator).
+        exponential                 Logical         Select whether or not the solution is computed with the exponential integrator.
+                                                        True: The solver jumps directly to each stored time level (see Schemes.Exponential).
+                                                        False: The solution is computed at every time step (Default).
+        tol                         Real            Tolerance for the exponential integrator (Default: 1e-8).
+        cache                       Logical         Select whether or not the neighbors and Gammas are reused from the on-disk cache.
+                                                        True: They are read from the cache, or computed and saved on it (see Scripts.Cache).
+                                                        False: They are always computed (Default).
+        holes                       Logical         Select whether or not the cloud has holes, described by the triangles tt.
+                                                        True: Only the visible nodes are neighbors, never across a hole (see Neighbors.Cloud_Holes).
+                                                        False: All the close nodes are neighbors (Default).
+        precision                   String          Precision of the time steps and of the stored solutions.
+                                                        'double': float64 (Default).
+                                                        'single': float32 operator, solution and u_ap; the Gammas are still computed in float64.
+        order                       String          Ordering of the nodes used for the time steps, the outputs keep the original order (see Scripts.Order).
+                                                        None: The order of p (Default).
+                                                        'hilbert': Along a Hilbert curve, the neighbors are close in memory.
+                                                        'rcm': Reverse Cuthill-McKee, the bandwidth of K is reduced.
+        threads                     Integer         Number of threads for the explicit time steps.
+                                                        None: K2 u is computed on one thread (Default).
+                                                        Integer: K2 u is computed by blocks of rows, with the boundary conditions, on a pool of threads (see Schemes.Blocks).
     
     Output:
-        u_ap        m x 1           Array           Array with the approximation computed by the routine.
-        u_ex        m x 1           Array           Array with the theoretical solution.
+        u_ap        m x s           Array           Array with the approximation computed by the routine on the s stored time levels.
+        u_ex        m x s           Array           Array with the theoretical solution on the s stored time levels.
         vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
     """
 
-    # Variable initialization
-    m    = len(p[:,0])                                                              # The total number of nodes is calculated.
-    nvec = 8                                                                        # Maximum number of neighbors for each node.
-    T    = np.linspace(0,1,t)                                                       # Time discretization.
-    dt   = T[1] - T[0]                                                              # dt computation.
-    u_ap = np.zeros([m,t])                                                          # u_ap initialization with zeros.
-    u_ex = np.zeros([m,t])                                                          # u_ex initialization with zeros.
-    
-    # Boundary conditions
-    for k in np.arange(t):                                                          # For all time steps.
-        for i in np.arange(m) :                                                     # For all the nodes.
-            if p[i,2] == 1:                                                         # If the node is in the boundary.
-                u_ap[i, k] = f(p[i, 0], p[i, 1], T[k], v)                           # The boundary condition is assigned.
-  
-    # Initial condition
-    for i in np.arange(m):                                                          # For each of the nodes.
-        u_ap[i, 0] = f(p[i, 0], p[i, 1], T[0], v)                                   # The initial condition is assigned.
-    
-    # Neighbor search for all the nodes.
-    if triangulation == True:                                                       # If there are triangles available.
-        vec = Neighbors.Triangulation(p, tt, nvec)                                  # Neighbor search with the proper routine.
-    else:                                                                           # If there are no triangles available.
-        vec = Neighbors.Cloud(p, nvec)                                              # Neighbor search with the proper routine.
-
-    # Computation of Gamma values
-    L = np.vstack([[0], [0], [2*v*dt], [0], [2*v*dt]])                              # The values of the differential operator are assigned.
-    K = Gammas.Cloud(p, vec, L)                                                     # K computation with the required Gammas.
-    
-    # Generalized Finite Differences Method
-    if implicit == False:                                                           # For the explicit scheme.
-        K2 = np.identity(m) + K                                                     # Explicit formulation of K.
-    else:                                                                           # For the implicit scheme.
-        K2 = np.linalg.pinv(np.identity(m) - (1-lam)*K)@(np.identity(m) + lam*K)    # Implicit formulation of K.
-
-    for k in np.arange(1,t):                                                        # For each of the time steps.
-        un = K2@u_ap[:,k-1]                                                         # The new time-level is computed.
-        for i in np.arange(m):                                                      # For all the nodes.
-            if p[i,2] == 0:                                                         # If the node is an inner node.
-                u_ap[i,k] = un[i]                                                   # Save the computed solution.
-        
-    # Theoretical Solution
-    for k in np.arange(t):                                                          # For all the time steps.
-        for i in np.arange(m):                                                      # For each of the nodes.
-            u_ex[i,k] = f(p[i,0], p[i,1], T[k], v)                                  # The theoretical solution is computed.
-
-    return u_ap, u_ex, vec
+    u_ap, u_ex, vec = Cloud_Ensemble(p, [f], v, t, triangulation, tt, implicit, lam, save, Single(callback), auto, tf, stats, exponential, tol, cache, holes, precision, order, threads)
+    return u_ap[:,0,:], u_ex[:,0,:], vec
 
-def Mesh(x, y, f, v, t, implicit = False, lam = 0.5):
+def Mesh(x, y, f, v, t, implicit = False, lam = 0.5, save = None, callback = None, matrix_free = False, auto = False, tf = 1, stats = None, exponential = False, tol = 1e-8, cache = False, precision = 'double', threads = None):
     """
     2D Diffusion Equation implemented in Logically Rectangular Meshes.
 
@@ -111,7 +106,7 @@ def Mesh(x, y, f, v, t, implicit = False, lam = 0.5):
     Input:
         x           m x n           Array           Array with the coordinates in x of the nodes.
         y           m x n           Array           Array with the coordinates in y of the nodes.
-        f                           Function        Function declared with the boundary condition.
+        f                           Function        Function declared with the boundary condition, evaluated on arrays as f(x, y, t, v).
         v                           Real            Diffusion coefficient.
         t                           Integer         Number of time steps considered.
         implicit                    Logical         Select whether or not use an implicit scheme.
@@ -119,61 +114,512 @@ def Mesh(x, y, f, v, t, implicit = False, lam = 0.5):
                                                         False: Explicit scheme used (Default).
         lam                         Real            Lambda parameter for the implicit scheme.
                                                         Must be between 0 and 1 (Default: 0.5).
+        save                        Various         Time levels to be stored (see Schedule).
+                                                        None: All the time levels are stored (Default).
+        callback                    Function        Function called as callback(k, T[k], u) with the solution at every time level.
+        matrix_free                 Logical         Select whether or not the explicit scheme is applied without assembling K.
+                                                        True: The 9-point stencil is applied directly on the mesh.
+                                                        False: A sparse K is assembled (Default).
+        auto                        Logical         Select whether or not the number of time steps is chosen from the stability limit of the scheme.
+                                                        True: t is replaced by the smallest stable number of time steps.
+                                                        False: t is used as given (Default).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run (see Scripts.Profile).
+                                                        't', 'dt' and 'dt_max': time discretization (dt_max is None if it was not found), 'dt_method': how dt_max was found (see Schemes.Stable).
+                                                        'time': wall time of each stage ('gammas', 'operator', 'steps', 'step', 'boundary', 'exact'...).
+                                                        'peak_memory': peak memory of the whole process up to the end of the run, in bytes.
+                                                        'operator': sparsity and conditioning of the operators (see Profile.Operator).
+        exponential                 Logical         Select whether or not the solution is computed with the exponential integrator.
+                                                        True: The solver jumps directly to each stored time level (see Schemes.Exponential).
+                                                        False: The solution is computed at every time step (Default).
+        tol                         Real            Tolerance for the exponential integrator (Default: 1e-8).
+        cache                       Logical         Select whether or not the neighbors and Gammas are reused from the on-disk cache.
+                                                        True: They are read from the cache, or computed and saved on it (see Scripts.Cache).
+                                                        False: They are always computed (Default).
+        precision                   String          Precision of the time steps and of the stored solutions.
+                                                        'double': float64 (Default).
+                                                        'single': float32 operator, solution and u_ap; the Gammas are still computed in float64.
+        threads                     Integer         Number of threads for the explicit time steps with an assembled K.
+                                                        None: K2 u is computed on one thread (Default).
+                                                        Integer: K2 u is computed by blocks of rows, with the boundary conditions, on a pool of threads (see Schemes.Blocks).
     
     Output:
-        u_ap        m x n x t       Array           Array with the approximation computed by the routine.
-        u_ex        m x n x t       Array           Array with the theoretical solution.
+        u_ap        m x n x s       Array           Array with the approximation computed by the routine on the s stored time levels.
+        u_ex        m x n x s       Array           Array with the theoretical solution on the s stored time levels.
+    """
+
+    u_ap, u_ex = Mesh_Ensemble(x, y, [f], v, t, implicit, lam, save, Single(callback), matrix_free, auto, tf, stats, exponential, tol, cache, precision, threads)
+    return u_ap[:,:,0,:], u_ex[:,:,0,:]
+
+def Cloud_Ensemble(p, f, v, t, triangulation = False, tt = [], implicit = False, lam = 0.5, save = None, callback = None, auto = False, tf = 1, stats = None, exponential = False, tol = 1e-8, cache = False, holes = False, precision = 'double', order = None, threads = None):
+    """
+    2D Diffusion Equation implemented on Unstructured Clouds of Points, for several cases at once.
+
+    This function solves B cases on the same cloud of points, with the same neighbors, Gammas and time discretization.
+    The solution is an m x B array, so each time step is a single sparse product for all the cases.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        f           B x 1           List            List of functions with the boundary condition of each case, evaluated on arrays as f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps to be considered.
+        triangulation               Logical         Select whether or not there is a triangulation available (Default: False).
+        tt          m x 3           Array           Array with the triangulation indexes.
+        implicit                    Logical         Select whether or not use an implicit scheme (Default: False).
+        lam                         Real            Lambda parameter for the implicit scheme (Default: 0.5).
+        save                        Various         Time levels to be stored (see Schedule).
+        callback                    Function        Function called as callback(k, T[k], u) with the m x B solution at every time level.
+        auto                        Logical         Select whether or not the number of time steps is chosen from the stability limit (Default: False).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run (see Cloud).
+        exponential                 Logical         Select whether or not the solver jumps directly to each stored time level (Default: False).
+                                                        The callback function is only called on the stored time levels.
+        tol                         Real            Tolerance for the exponential integrator (Default: 1e-8).
+        cache                       Logical         Select whether or not the neighbors and Gammas are reused from the on-disk cache (Default: False).
+        holes                       Logical         Select whether or not the cloud has holes, described by the triangles tt (Default: False).
+        precision                   String          Precision of the time steps and of the stored solutions, 'double' or 'single' (Default: 'double').
+        order                       String          Ordering of the nodes used for the time steps, None, 'hilbert' or 'rcm' (Default: None).
+        threads                     Integer         Number of threads for the explicit time steps, None for one thread (Default: None).
+
+    Output:
+        u_ap        m x B x s       Array           Array with the approximation of each case on the s stored time levels.
+        u_ex        m x B x s       Array           Array with the theoretical solution of each case on the s stored time levels.
+        vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
+    """
+
+    # Variable initialization
+    m    = len(p[:,0])                                                              # The total number of nodes is calculated.
+    nvec = 8                                                                        # Maximum number of neighbors for each node.
+    B    = len(f)                                                                   # The number of cases.
+    L    = np.vstack([[0], [0], [2*v], [0], [2*v]])                                 # The values of the differential operator are assigned, for dt = 1.
+    dtype = Dtype(precision)                                                        # Type of the time steps and the stored solutions.
+    
+    if cache == True:                                                               # If the cache is requested.
+        with Profile.Stage(stats, 'cache'):
+            vec, K1 = Cache.Cloud(p, tt, nvec, L, triangulation, holes)             # Neighbors and K, for dt = 1.
+    else:                                                                           # If everything is computed.
+        # Neighbor search for all the nodes.
+        with Profile.Stage(stats, 'neighbors'):
+            if triangulation == True:                                               # If there are triangles available.
+                vec = Neighbors.Triangulation(p, tt, nvec)                          # Neighbor search with the proper routine.
+            elif holes == True:                                                     # If the cloud has holes.
+                vec = Neighbors.Cloud_Holes(p, tt, nvec)                            # Neighbor search with the proper routine.
+            else:                                                                   # If there are no triangles available.
+                vec = Neighbors.Cloud(p, nvec)                                      # Neighbor search with the proper routine.
+
+        # Computation of Gamma values
+        with Profile.Stage(stats, 'gammas'):
+            K1 = Gammas.Cloud(p, vec, L, sparse = True)                             # K computation with the required Gammas, for dt = 1.
+
+    # Reordering of the nodes
+    if order is not None:                                                           # If the nodes are reordered.
+        with Profile.Stage(stats, 'order'):
+            perm, inv = Order.Permutation(p, K1, order)                             # New order of the nodes.
+            K1 = Order.Matrix(K1, perm)                                             # The same K on the new order, for dt = 1.
+        p = p[perm]                                                                 # The nodes on the new order.
+        if callback is not None:                                                    # The callback function gets the original order.
+            call     = callback
+            callback = lambda k, tk, u: call(k, tk, u[inv])
+
+    # Time discretization
+    with Profile.Stage(stats, 'stability'):
+        t = Steps(K1, t, tf, implicit, lam, auto, stats)                            # The number of time steps.
+    T    = np.linspace(0,tf,t)                                                      # Time discretization.
+    dt   = T[1] - T[0]                                                              # dt computation.
+    K    = dt*K1                                                                    # K is scaled with dt.
+    sav  = Schedule(T, save)                                                        # Time levels to be stored.
+    u_ap = np.zeros([m,B,len(sav)], dtype = dtype)                                  # u_ap initialization with zeros.
+    bnd  = np.where(p[:,2] == 1)[0]                                                 # Boundary nodes.
+    gb   = Profile.Timed(Boundaries(f, p[bnd,0], p[bnd,1], T, v), stats, 'boundary')  # Boundary conditions for all the time steps.
+  
+    # Initial condition
+    with Profile.Stage(stats, 'exact'):
+        u = Exact_Ensemble(f, p[:,0], p[:,1], T[0:1], v)[..., 0].astype(dtype)      # The initial condition is assigned for all the cases.
+    
+    # Exponential integrator
+    if exponential == True:                                                         # If the stored time levels are computed directly.
+        def g(tt):
+            return Exact_Ensemble(f, p[bnd,0], p[bnd,1], tt, v)                     # Boundary conditions at the times tt.
+        with Profile.Stage(stats, 'steps'):
+            U = Schemes.Exponential(K1, p[:,2] == 1, u, g, T[sav], tol)             # Solution on the stored time levels.
+            for s in np.arange(len(sav)):                                           # For each of the stored time levels.
+                Output(sav[s], T, next(U), u_ap, sav, s, callback)                  # The time level is stored.
+        Profile.Operator(stats, K1)
+        with Profile.Stage(stats, 'exact'):
+            u_ex = Exact_Ensemble(f, p[:,0], p[:,1], T[sav], v)                     # Only on the stored time levels.
+        if order is not None:                                                       # If the nodes were reordered.
+            u_ap, u_ex = u_ap[inv], u_ex[inv]                                       # Back to the original order.
+        return u_ap, u_ex, vec
+
+    # Generalized Finite Differences Method
+    with Profile.Stage(stats, 'operator'):
+        if implicit == False:                                                       # For the explicit scheme.
+            K2 = Schemes.Explicit(K, dtype)                                         # Explicit formulation of K.
+        else:                                                                       # For the implicit scheme.
+            K2 = Schemes.Implicit(K, lam, dtype)                                    # Implicit formulation of K, factorized once.
+        threads = threads if implicit == False else None                            # Only the explicit scheme is threaded.
+        if threads is not None:                                                     # If the explicit steps are computed on several threads.
+            step = Schemes.Blocks(K2, bnd, threads)                                 # Blocks of rows with their boundary nodes.
+    Profile.Operator(stats, K1, K2)
+
+    s = 0                                                                           # Counter of the stored time levels.
+    with Profile.Stage(stats, 'steps'):
+        for k in np.arange(t):                                                      # For each of the time steps.
+            if k > 0 and threads is not None:                                       # For the explicit scheme on several threads.
+                u = step(u, next(gb))                                               # New time level with the boundary condition.
+            elif k > 0:                                                             # The initial condition is already known.
+                u = K2@u                                                            # The new time-level is computed for all the cases.
+                u[bnd] = next(gb)                                                   # The boundary condition is assigned.
+            s = Output(k, T, u, u_ap, sav, s, callback)                             # The time level is stored if requested.
+    Per_Step(stats, t)
+        
+    # Theoretical Solution
+    with Profile.Stage(stats, 'exact'):
+        u_ex = Exact_Ensemble(f, p[:,0], p[:,1], T[sav], v)                         # Only on the stored time levels.
+    if order is not None:                                                           # If the nodes were reordered.
+        u_ap, u_ex = u_ap[inv], u_ex[inv]                                           # Back to the original order.
+
+    return u_ap, u_ex, vec
+
+def Mesh_Ensemble(x, y, f, v, t, implicit = False, lam = 0.5, save = None, callback = None, matrix_free = False, auto = False, tf = 1, stats = None, exponential = False, tol = 1e-8, cache = False, precision = 'double', threads = None):
+    """
+    2D Diffusion Equation implemented in Logically Rectangular Meshes, for several cases at once.
+
+    This routine solves B cases on the same mesh, with the same Gammas and time discretization.
+    The solution is an m x n x B array, so each time step is a single sparse product (or stencil sweep) for all the cases.
+
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+        f           B x 1           List            List of functions with the boundary condition of each case, evaluated on arrays as f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps considered.
+        implicit                    Logical         Select whether or not use an implicit scheme (Default: False).
+        lam                         Real            Lambda parameter for the implicit scheme (Default: 0.5).
+        save                        Various         Time levels to be stored (see Schedule).
+        callback                    Function        Function called as callback(k, T[k], u) with the m x n x B solution at every time level.
+        matrix_free                 Logical         Select whether or not the explicit scheme is applied without assembling K (Default: False).
+        auto                        Logical         Select whether or not the number of time steps is chosen from the stability limit (Default: False).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run (see Mesh).
+        exponential                 Logical         Select whether or not the solver jumps directly to each stored time level (Default: False).
+                                                        The callback function is only called on the stored time levels.
+        tol                         Real            Tolerance for the exponential integrator (Default: 1e-8).
+        cache                       Logical         Select whether or not the neighbors and Gammas are reused from the on-disk cache (Default: False).
+        precision                   String          Precision of the time steps and of the stored solutions, 'double' or 'single' (Default: 'double').
+        threads                     Integer         Number of threads for the explicit time steps with an assembled K, None for one thread (Default: None).
+
+    Output:
+        u_ap        m x n x B x s   Array           Array with the approximation of each case on the s stored time levels.
+        u_ex        m x n x B x s   Array           Array with the theoretical solution of each case on the s stored time levels.
     """
 
     # Variable initialization
     m    = len(x[:,0])                                                              # The number of nodes in x.
     n    = len(x[0,:])                                                              # The number of nodes in y.
-    T    = np.linspace(0,1,t)                                                       # Time discretization.
+    B    = len(f)                                                                   # The number of cases.
+    dtype = Dtype(precision)                                                        # Type of the time steps and the stored solutions.
+
+    # Computation of K with Gammas
+    L  = np.vstack([[0], [0], [2*v], [0], [2*v]])                                   # The values of the differential operator are assigned, for dt = 1.
+    matrix_free = matrix_free and implicit == False and exponential == False        # The implicit scheme requires K.
+    with Profile.Stage(stats, 'cache' if cache == True else 'gammas'):
+        if matrix_free == True:                                                     # For the matrix-free explicit scheme.
+            if cache == True:                                                       # If the cache is requested.
+                G1 = Schemes.Fields(Cache.Mesh_Gammas(x, y, L))                     # The nine Gamma fields, for dt = 1.
+            else:                                                                   # If the Gammas are computed.
+                G1 = Schemes.Fields(Gammas.Mesh_Gammas(x, y, L))                    # The nine Gamma fields, for dt = 1.
+        if (matrix_free == False or auto == True) and cache == True:                # If K is needed and the cache is requested.
+            K1 = Cache.Mesh(x, y, L)                                                # K computation that include the Gammas, for dt = 1.
+        elif matrix_free == False or auto == True:                                  # If K is assembled or needed for the time step.
+            K1 = Gammas.Mesh(x, y, L, sparse = True)                                # K computation that include the Gammas, for dt = 1.
+        else:                                                                       # If K is not needed.
+            K1 = None                                                               # There is no global matrix.
+
+    # Time discretization
+    with Profile.Stage(stats, 'stability'):
+        t = Steps(K1, t, tf, implicit, lam, auto, stats)                            # The number of time steps.
+    T    = np.linspace(0,tf,t)                                                      # Time discretization.
     dt   = T[1] - T[0]                                                              # dt computation.
-    u_ap = np.zeros([m, n, t])                                                      # u_ap initialization with zeros.
-    u_ex = np.zeros([m, n, t])                                                      # u_ex initialization with zeros.
-    urr  = np.zeros([m*n, 1])                                                       # u_rr initialization with zeros.
-
-    # Boundary conditions
-    for k in np.arange(t):
-        for i in np.arange(m):                                                      # For each of the nodes on the x boundaries.
-            u_ap[i, 0,   k] = f(x[i, 0], y[i, 0], T[k], v)                          # The boundary condition is assigned at the first y.
-            u_ap[i, n-1, k] = f(x[i, n-1], y[i, n-1], T[k], v)                      # The boundary condition is assigned at the last y.
-        for j in np.arange(n):                                                      # For each of the nodes on the y boundaries.
-            u_ap[0,   j, k] = f(x[0, j], y[0, j], T[k], v)                          # The boundary condition is assigned at the first x.
-            u_ap[m-1, j, k] = f(x[m-1, j], y[m-1, j], T[k], v)                      # The boundary condition is assigned at the last x.
+    sav  = Schedule(T, save)                                                        # Time levels to be stored.
+    u_ap = np.zeros([m, n, B, len(sav)], dtype = dtype)                             # u_ap initialization with zeros.
+    bnd  = np.ones([m, n], dtype = bool)                                            # Boundary nodes.
+    bnd[1:m-1, 1:n-1] = False                                                       # Inner nodes are removed.
+    gb   = Profile.Timed(Boundaries(f, x[bnd], y[bnd], T, v), stats, 'boundary')    # Boundary conditions for all the time steps.
   
     # Initial condition
-    for i in np.arange(m):                                                          # For each of the nodes on x.
-        for j in np.arange(n):                                                      # For each of the nodes on y.
-            u_ap[i, j, 0] = f(x[i, j], y[i, j], T[0], v)                            # The initial condition is assigned.
+    with Profile.Stage(stats, 'exact'):
+        u = Exact_Ensemble(f, x, y, T[0:1], v)[..., 0].astype(dtype)                # The initial condition is assigned for all the cases.
 
-    # Computation of K with Gammas
-    L  = np.vstack([[0], [0], [2*v*dt], [0], [2*v*dt]])                             # The values of the differential operator are assigned.
-    K  = Gammas.Mesh(x, y, L)                                                       # K computation that include the Gammas.
+    if matrix_free == True:                                                         # For the matrix-free explicit scheme.
+        G  = (dt*G1).astype(dtype)                                                  # The Gamma fields are scaled with dt.
+    else:                                                                           # If K is assembled.
+        K  = dt*K1                                                                  # K is scaled with dt.
 
-    if implicit == False:                                                           # For the explicit scheme.
-        K2 = np.identity(m*n) + K                                                   # Kp with an explicit formulation.
-    else:                                                                           # For the implicit scheme.
-        K2 = np.linalg.pinv(np.identity(m*n) \
-                            - (1-lam)*K)@(np.identity(m*n) + lam*K)                 # Kp with an explicit formulation.
+    # Exponential integrator
+    if exponential == True:                                                         # If the stored time levels are computed directly.
+        bf = bnd.reshape(m*n, order = 'F')                                          # Boundary nodes (i + j*m).
+        xb = x.reshape(m*n, order = 'F')[bf]                                        # x coordinates of the boundary nodes (i + j*m).
+        yb = y.reshape(m*n, order = 'F')[bf]                                        # y coordinates of the boundary nodes (i + j*m).
+        def g(tt):
+            return Exact_Ensemble(f, xb, yb, tt, v)                                 # Boundary conditions at the times tt.
+        with Profile.Stage(stats, 'steps'):
+            U = Schemes.Exponential(K1, bf, u.reshape(m*n, B, order = 'F'), g, T[sav], tol)
+            for s in np.arange(len(sav)):                                           # For each of the stored time levels.
+                u = next(U).reshape(m, n, B, order = 'F')                           # Solution on the mesh.
+                Output(sav[s], T, u, u_ap, sav, s, callback)                        # The time level is stored.
+        Profile.Operator(stats, K1)
+        with Profile.Stage(stats, 'exact'):
+            u_ex = Exact_Ensemble(f, x, y, T[sav], v)                               # Only on the stored time levels.
+        return u_ap, u_ex
 
-    # A Generalized Finite Differences Method
-    for k in np.arange(1,t):                                                        # For each time step.
-        for i in np.arange(m):                                                      # For each of the nodes on x.
-            for j in np.arange(n):                                                  # For each of the nodes on y.
-                urr[i + j*m, 0] = u_ap[i, j, k-1]                                   # urr as a row vector with all the solution.
-                
-        un = K2@urr                                                                 # New time level is computed.
+    with Profile.Stage(stats, 'operator'):
+        if matrix_free == True:                                                     # For the matrix-free explicit scheme.
+            K2 = None                                                               # There is no global matrix.
+        elif implicit == False:                                                     # For the explicit scheme.
+            K2 = Schemes.Explicit(K, dtype)                                         # Kp with an explicit formulation.
+        else:                                                                       # For the implicit scheme.
+            K2 = Schemes.Implicit(K, lam, dtype)                                    # Kp with an implicit formulation, factorized once.
+        threads = threads if matrix_free == False and implicit == False else None   # Only the assembled explicit scheme is threaded.
+        if threads is not None:                                                     # If the explicit steps are computed on several threads.
+            i, j = np.nonzero(bnd)                                                  # Boundary nodes, in the order of the boundary conditions.
+            step = Schemes.Blocks(K2, i + j*m, threads)                             # Blocks of rows with their boundary nodes (i + j*m).
+    Profile.Operator(stats, K1, K2)
 
-        for i in np.arange(1,m-1):                                                  # For each of the interior nodes on x.
-            for j in np.arange(1,n-1):                                              # For each of the interior nodes on y.
-                u_ap[i, j, k] = un[i + j*m]                                         # u_ap values are assigned.
+    # A Generalized Finite Differences Method
+    s = 0                                                                           # Counter of the stored time levels.
+    with Profile.Stage(stats, 'steps'):
+        for k in np.arange(t):                                                      # For each time step.
+            if k > 0 and matrix_free == True:                                       # For the matrix-free explicit scheme.
+                u = Schemes.Stencil(G, u)                                           # New time level is computed on the mesh.
+                u[bnd] = next(gb)                                                   # The boundary condition is assigned.
+            elif k > 0 and threads is not None:                                     # For the explicit scheme on several threads.
+                urr = u.reshape(m*n, B, order = 'F')                                # urr with all the solution (i + j*m) for each case.
+                u   = step(urr, next(gb)).reshape(m, n, B, order = 'F')             # New time level with the boundary condition.
+            elif k > 0:                                                             # The initial condition is already known.
+                urr = u.reshape(m*n, B, order = 'F')                                # urr with all the solution (i + j*m) for each case.
+                u   = (K2@urr).reshape(m, n, B, order = 'F')                        # New time level is computed.
+                u[bnd] = next(gb)                                                   # The boundary condition is assigned.
+            s = Output(k, T, u, u_ap, sav, s, callback)                             # The time level is stored if requested.
+    Per_Step(stats, t)
 
     # Theoretical Solution
-    for k in np.arange(t):                                                          # For all the time steps.
-        for i in np.arange(m):                                                      # For all the nodes on x.
-            for j in np.arange(n):                                                  # For all the nodes on y.
-                u_ex[i, j, k] = f(x[i, j], y[i, j], T[k], v)                        # The theoretical solution is computed.
+    with Profile.Stage(stats, 'exact'):
+        u_ex = Exact_Ensemble(f, x, y, T[sav], v)                                   # Only on the stored time levels.
+
+    return u_ap, u_ex
+
+def Steps(K1, t, tf = 1, implicit = False, lam = 0.5, auto = False, stats = None):
+    """
+    Steps
+    Function to find the number of time steps used by the solvers.
+    If requested, the number of time steps is the smallest one that satisfies the stability limit of the scheme (see Schemes.Stable).
 
-    return u_ap, u_ex
\ No newline at end of file
+    Input:
+        K1          m x m           Sparse          K Matrix with the computed Gammas for dt = 1.
+        t                           Integer         Number of time steps requested.
+        tf                          Real            Final time (Default: 1).
+        implicit                    Logical         Select whether or not an implicit scheme is used (Default: False).
+        lam                         Real            Lambda parameter for the implicit scheme (Default: 0.5).
+        auto                        Logical         Select whether or not t is chosen from the stability limit (Default: False).
+        stats                       Dictionary      Dictionary filled with 't', 'dt', 'dt_max' and 'dt_method'.
+
+    Output:
+        t                           Integer         Number of time steps to be used.
+    """
+    if auto == True:                                                                # If the stability limit is requested.
+        if implicit == False:                                                       # For the explicit scheme.
+            lam = 1                                                                 # Explicit weight of the scheme.
+        dt_max = Schemes.Stable(K1, lam, stats = stats)                             # Largest stable dt, nan if there is none.
+        if np.isfinite(dt_max):                                                     # If the scheme is conditionally stable, t is kept otherwise.
+            t = max(int(np.ceil(tf/dt_max)) + 1, 2)                                 # Smallest stable number of time steps.
+    else:                                                                           # If t is used as given.
+        dt_max = np.nan                                                             # The stability limit is not computed.
+    if stats is not None:                                                           # If the information is requested.
+        stats['t']      = t                                                         # Number of time steps.
+        stats['dt']     = tf/(t-1)                                                  # Time step.
+        stats['dt_max'] = float(dt_max) if np.isfinite(dt_max) else None            # Estimated stability limit, None if there is no finite one.
+    return t
+
+def Per_Step(stats, t):
+    """
+    Per_Step
+    Function to store the time of each time step, without the boundary conditions, on stats['time']['step'].
+
+    Input:
+        stats                       Dictionary      Dictionary with the information about the run, or None.
+        t                           Integer         Number of time steps.
+    """
+    if stats is not None and t > 1:                                                 # If the information is requested.
+        tim = stats['time']
+        tim['step'] = (tim['steps'] - tim.get('boundary', 0))/(t - 1)               # Average time of each step.
+
+def Schedule(T, save = None):
+    """
+    Schedule
+    Function to find the time levels that are stored by the solvers.
+
+    Input:
+        T           t x 1           Array           Array with the time discretization.
+        save                        Various         Time levels to be stored.
+                                                        None: All the time levels are stored (Default).
+                                                        Integer N: Every N time steps, and the last one. N must be at least 1.
+                                                        Array: Times to be stored, rounded to the closest time level.
+
+    Output:
+        sav         s x 1           Array           Array with the indexes of the stored time levels.
+    """
+    t = len(T)                                                                      # The number of time steps.
+    if save is None:                                                                # If all the time levels are requested.
+        sav = np.arange(t)                                                          # All the time levels are stored.
+    elif np.ndim(save) == 0:                                                        # If the time levels are requested every N steps.
+        if int(save) < 1:                                                           # N must be a number of steps.
+            raise ValueError('Invalid save ' + str(save) + ', every N steps needs an integer N >= 1.')
+        sav = np.union1d(np.arange(0, t, int(save)), [t-1])                         # Every N time steps and the last one.
+    else:                                                                           # If a list of times is requested.
+        dt  = T[1] - T[0]                                                           # dt computation.
+        sav = np.rint((np.asarray(save, dtype = float) - T[0])/dt)                  # The closest time level to each time.
+        sav = np.unique(np.clip(sav, 0, t-1))                                       # Sorted time levels inside the time interval.
+    return sav.astype(int)
+
+def Dtype(precision):
+    """
+    Dtype
+    Function to find the floating point type of a precision of the solvers.
+
+    Input:
+        precision                   String          Precision of the time steps and of the stored solutions.
+                                                        'double': 64 bits.
+                                                        'single': 32 bits.
+
+    Output:
+        dtype                       Type            Numpy type of the precision.
+    """
+    if precision == 'double':                                                       # 64 bits.
+        return np.float64
+    elif precision == 'single':                                                     # 32 bits.
+        return np.float32
+    else:
+        raise ValueError('Unknown precision ' + str(precision) + ', it must be one of ' + ', '.join(precisions) + '.')
+
+def Exact(f, x, y, T, v):
+    """
+    Exact
+    Function to evaluate the theoretical solution on all the nodes at several times with a single call to f.
+    It can be used to compute the theoretical solution only at the times that are actually needed.
+
+    Input:
+        f                           Function        Function declared with the theoretical solution.
+        x           m x n           Array           Array with the coordinates in x of the nodes (or m x 1 for clouds).
+        y           m x n           Array           Array with the coordinates in y of the nodes (or m x 1 for clouds).
+        T           s x 1           Array           Array with the times to evaluate.
+        v                           Real            Diffusion coefficient.
+
+    Output:
+        u_ex        m x n x s       Array           Array with the theoretical solution (or m x s for clouds).
+    """
+    x    = np.asarray(x)[..., np.newaxis]                                           # The nodes are broadcast over the times.
+    y    = np.asarray(y)[..., np.newaxis]                                           # The nodes are broadcast over the times.
+    u_ex = np.zeros(x.shape[:-1] + (len(T),)) + f(x, y, np.asarray(T), v)           # The theoretical solution is computed.
+    return u_ex
+
+def Boundary(f, xb, yb, T, v, nb = 256):
+    """
+    Boundary
+    Generator with the boundary conditions for the time steps 1 to t-1.
+    The boundary condition is evaluated on blocks of nb time steps at once.
+
+    Input:
+        f                           Function        Function declared with the boundary condition.
+        xb          b x 1           Array           Array with the coordinates in x of the boundary nodes.
+        yb          b x 1           Array           Array with the coordinates in y of the boundary nodes.
+        T           t x 1           Array           Array with the time discretization.
+        v                           Real            Diffusion coefficient.
+        nb                          Integer         Number of time steps on each block (Default: 256).
+
+    Output:
+        ub          b x 1           Array           Array with the boundary condition for each time step.
+    """
+    for k0 in np.arange(1, len(T), nb):                                             # For each block of time steps.
+        gb = Exact(f, xb, yb, T[k0:k0+nb], v)                                       # The boundary condition on the block.
+        for k in np.arange(gb.shape[1]):                                            # For each time step on the block.
+            yield gb[:, k]                                                          # The boundary condition is returned.
+
+def Exact_Ensemble(f, x, y, T, v):
+    """
+    Exact_Ensemble
+    Function to evaluate the theoretical solution of several cases on all the nodes at several times.
+
+    Input:
+        f           B x 1           List            List of functions with the theoretical solution of each case.
+        x           m x n           Array           Array with the coordinates in x of the nodes (or m x 1 for clouds).
+        y           m x n           Array           Array with the coordinates in y of the nodes (or m x 1 for clouds).
+        T           s x 1           Array           Array with the times to evaluate.
+        v                           Real            Diffusion coefficient.
+
+    Output:
+        u_ex        m x n x B x s   Array           Array with the theoretical solution (or m x B x s for clouds).
+    """
+    u_ex = np.stack([Exact(fb, x, y, T, v) for fb in f], axis = -2)                 # The theoretical solution of each case.
+    return u_ex
+
+def Boundaries(f, xb, yb, T, v, nb = 256):
+    """
+    Boundaries
+    Generator with the boundary conditions of several cases for the time steps 1 to t-1.
+
+    Input:
+        f           B x 1           List            List of functions with the boundary condition of each case.
+        xb          b x 1           Array           Array with the coordinates in x of the boundary nodes.
+        yb          b x 1           Array           Array with the coordinates in y of the boundary nodes.
+        T           t x 1           Array           Array with the time discretization.
+        v                           Real            Diffusion coefficient.
+        nb                          Integer         Number of time steps on each block (Default: 256).
+
+    Output:
+        ub          b x B           Array           Array with the boundary condition of each case for each time step.
+    """
+    gb = [Boundary(fb, xb, yb, T, v, nb) for fb in f]                               # A generator for each case.
+    for ub in zip(*gb):                                                             # For each time step.
+        yield np.stack(ub, axis = -1)                                               # The boundary conditions of all the cases.
+
+def Single(callback):
+    """
+    Single
+    Function to adapt a callback function of a single case to the solution of an ensemble with one case.
+
+    Input:
+        callback                    Function        Function called as callback(k, T[k], u) with the solution of a single case.
+
+    Output:
+        cb                          Function        Function called as cb(k, T[k], u) with the solution of an ensemble with one case.
+    """
+    if callback is None:                                                            # If there is no callback function.
+        return None
+    def cb(k, tk, u):
+        callback(k, tk, u[..., 0])                                                  # Only the first case is passed.
+    return cb
+
+def Output(k, T, u, u_ap, sav, s, callback = None):
+    """
+    Output
+    Function to store the current time level, if requested, and to pass it to the callback function.
+
+    Input:
+        k                           Integer         The current time step.
+        T           t x 1           Array           Array with the time discretization.
+        u           m x 1           Array           Array with the current time level (or m x n for meshes).
+        u_ap        m x s           Array           Array with the stored time levels (or m x n x s for meshes).
+        sav         s x 1           Array           Array with the indexes of the stored time levels.
+        s                           Integer         The number of time levels already stored.
+        callback                    Function        Function called as callback(k, T[k], u).
+
+    Output:
+        s                           Integer         The updated number of time levels stored.
+    """
+    if callback is not None:                                                        # If there is a callback function.
+        callback(k, T[k], u)                                                        # The current time level is passed.
+    if s < len(sav) and sav[s] == k:                                                # If the current time level is requested.
+        u_ap[..., s] = u                                                            # The current time level is stored.
+        s += 1                                                                      # Increase the counter by 1.
+    return s
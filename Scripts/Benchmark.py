@@ -0,0 +1,302 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import tracemalloc
+import numpy as np
+import scipy
+import Scripts.Catalog as Catalog
+import Scripts.Neighbors as Neighbors
+import Scripts.Gammas as Gammas
+import Scripts.Schemes as Schemes
+import Scripts.Errors as Errors
+import Scripts.Sweep as Sweep
+import Diffusion_2D
+
+# Folders with the geometries
+folders = ['Clouds', 'Holes', 'Meshes']
+
+# Stages measured on each geometry
+stages = ['load', 'neighbors', 'gammas', 'implicit', 'explicit_step', 'implicit_step', 'error', 'render', 'preview']
+
+# Files with the results and the baseline
+output   = os.path.join('Results', 'Benchmarks', 'Benchmark.json')
+baseline = os.path.join('Results', 'Benchmarks', 'Baseline.json')
+
+def Measure(fun, repeat = 1):
+    """
+    Measure
+    Function to measure the wall time and the peak memory of a function.
+    The time is the best of repeat runs, and the peak memory is measured on one more run traced with tracemalloc, so the tracing does not change the time.
+
+    Input:
+        fun                         Function        Function without arguments.
+        repeat                      Integer         Number of runs for the time (Default: 1).
+
+    Output:
+        out                         Various         Output of the function.
+        tim                         Real            Wall time in seconds.
+        mem                         Integer         Peak memory allocated by the function through Python and NumPy, in bytes.
+    """
+    tim = np.inf
+    for r in np.arange(repeat):                                                     # For each of the timed runs.
+        t0  = time.perf_counter()
+        out = fun()
+        tim = min(tim, time.perf_counter() - t0)                                    # The best of the runs.
+    tracemalloc.start()                                                             # NumPy reports its buffers to tracemalloc.
+    out = fun()
+    mem = tracemalloc.get_traced_memory()[1]                                        # Peak of the traced run.
+    tracemalloc.stop()
+    return out, tim, mem
+
+def March(K2, u, bnd, steps):
+    """
+    March
+    Function to apply several time steps with a constant boundary condition, as in the step loop of Diffusion_2D.
+
+    Input:
+        K2          m x m           Operator        Time-stepping operator.
+        u           m x 1           Array           Initial condition.
+        bnd         m x 1           Array           Boundary nodes.
+        steps                       Integer         Number of time steps.
+
+    Output:
+        u           m x 1           Array           Solution after the time steps.
+    """
+    g = u[bnd]                                                                      # Boundary condition.
+    for k in np.arange(steps):                                                      # For each time step.
+        u = K2@u                                                                    # The new time level is computed.
+        u[bnd] = g                                                                  # The boundary condition is assigned.
+    return u
+
+def Geometry(folder, reg, size, steps = 100, repeat = 1, render = True, frames = 10):
+    """
+    Geometry
+    Function to measure all the stages on one geometry.
+
+    Input:
+        folder                      String          Folder of the geometry (Clouds, Holes or Meshes).
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        steps                       Integer         Number of time steps used for the step cost and the error (Default: 100).
+        repeat                      Integer         Number of runs for the time of each stage (Default: 1).
+        render                      Logical         Select whether or not the rendering is measured (Default: True).
+        frames                      Integer         Number of frames used for the preview (Default: 10).
+
+    Output:
+        res                         Dictionary      Dictionary with {'time', 'memory'} for each stage, and the number of nodes.
+                                                        The time of the step and render stages is per step or frame.
+    """
+    res = {}                                                                        # Results of the stages.
+
+    def add(stage, fun, per = 1):
+        out, tim, mem = Measure(fun, repeat)
+        res[stage] = {'time': tim/per, 'memory': mem}
+        return out
+
+    geo = add('load', lambda: {k: np.array(a) for k, a in Catalog.Load(folder, reg, size).items()})
+    L   = np.vstack([[0], [0], [2*Sweep.v], [0], [2*Sweep.v]])                      # The differential operator, for dt = 1.
+    if 'x' in geo:                                                                  # For logically rectangular meshes.
+        x, y = geo['x'], geo['y']
+        m, n = x.shape
+        K1   = add('gammas', lambda: Gammas.Mesh(x, y, L, sparse = True))
+        bnd  = np.ones([m, n], dtype = bool)                                        # Boundary nodes.
+        bnd[1:m-1, 1:n-1] = False                                                   # Inner nodes are removed.
+        bnd  = bnd.reshape(m*n, order = 'F')                                        # Boundary nodes (i + j*m).
+        X, Y = x.reshape(m*n, order = 'F'), y.reshape(m*n, order = 'F')
+    else:                                                                           # For clouds of points.
+        p    = geo['p']
+        if folder == 'Holes':                                                       # Never across a hole.
+            vec = add('neighbors', lambda: Neighbors.Cloud_Holes(p, geo['tt'], 8))
+        else:
+            vec = add('neighbors', lambda: Neighbors.Cloud(p, 8))
+        K1   = add('gammas', lambda: Gammas.Cloud(p, vec, L, sparse = True))
+        bnd  = p[:,2] == 1                                                          # Boundary nodes.
+        X, Y = p[:,0], p[:,1]
+    res['nodes'] = len(X)                                                           # The total number of nodes.
+
+    t   = Sweep.Steps(size)                                                         # Number of time steps used by the sweep.
+    K   = K1/(t-1)                                                                  # K is scaled with dt.
+    K2  = add('implicit', lambda: Schemes.Implicit(K, 0.5))
+    K2e = Schemes.Explicit(K)                                                       # Explicit formulation of K.
+    u0  = Sweep.fDIF(X, Y, 0, Sweep.v)                                              # Initial condition.
+    add('explicit_step', lambda: March(K2e, u0.copy(), bnd, steps), steps)
+    add('implicit_step', lambda: March(K2, u0.copy(), bnd, steps), steps)
+
+    T = np.linspace(0, 1, t)[:steps]                                                # The first time levels.
+    if 'x' in geo:                                                                  # For logically rectangular meshes.
+        u_ex = Diffusion_2D.Exact(Sweep.fDIF, x, y, T, Sweep.v)
+        add('error', lambda: Errors.Mesh(x, y, u_ex, u_ex))
+    else:                                                                           # For clouds of points.
+        u_ex = Diffusion_2D.Exact(Sweep.fDIF, X, Y, T, Sweep.v)
+        add('error', lambda: Errors.Cloud(p, vec, u_ex, u_ex))
+
+    if render == True:                                                              # If the rendering is requested.
+        import Scripts.Graph as Graph
+        zlim = [u_ex.min(), u_ex.max()]
+        args = [(u_ex[...,k], u_ex[...,k], T[k], zlim) for k in np.arange(min(frames, steps))]
+        def draw(preview):
+            Graph._Start(geo, preview)
+            for a in args[:len(args) if preview else 1]:                            # Only one frame of the 3D surfaces.
+                Graph.Image(a)
+            Graph._Stop()
+        add('render', lambda: draw(False))
+        add('preview', lambda: draw(True), len(args))
+    return res
+
+def Precision(folder, reg, size, implicit = False):
+    """
+    Precision
+    Function to compare the single and double precision time steps on one geometry.
+    The whole problem of the sweep is solved with both precisions, and the errors are measured on the stored time levels.
+
+    Input:
+        folder                      String          Folder of the geometry (Clouds, Holes or Meshes).
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        implicit                    Logical         Select whether or not the implicit scheme is used (Default: False).
+
+    Output:
+        res                         Dictionary      Dictionary with, for 'double' and 'single', the time of each step and the largest error,
+                                                        and the largest difference between both solutions.
+    """
+    geo = {k: np.array(a) for k, a in Catalog.Load(folder, reg, size).items()}
+    t   = Sweep.Steps(size)                                                         # Number of time steps used by the sweep.
+    res = {}
+    sol = {}                                                                        # Solutions with both precisions.
+    for prec in ['double', 'single']:                                               # For both precisions.
+        sts = {}
+        if 'x' in geo:                                                              # For logically rectangular meshes.
+            u_ap, u_ex = Diffusion_2D.Mesh(geo['x'], geo['y'], Sweep.fDIF, Sweep.v, t, implicit, save = 10, stats = sts, precision = prec)
+        else:                                                                       # For clouds of points.
+            u_ap, u_ex, vec = Diffusion_2D.Cloud(geo['p'], Sweep.fDIF, Sweep.v, t, implicit = implicit, tt = geo.get('tt', []),
+                                                 save = 10, stats = sts, holes = folder == 'Holes', precision = prec)
+        res[prec] = {'step': sts['time']['step'], 'error': float(np.abs(u_ap - u_ex).max())}
+        sol[prec] = u_ap
+    res['difference'] = float(np.abs(sol['single'] - sol['double']).max())
+    return res
+
+def Run(flds = None, regs = None, sizs = None, steps = 100, repeat = 1, render = True, precision = False):
+    """
+    Run
+    Function to measure all the stages on several geometries.
+
+    Input:
+        flds                        List            Folders of the geometries (Default: all of them).
+        regs                        List            Regions (Default: all of them).
+        sizs                        List            Sizes (Default: 1, 2 and 3).
+        steps                       Integer         Number of time steps used for the step cost and the error (Default: 100).
+        repeat                      Integer         Number of runs for the time of each stage (Default: 1).
+        render                      Logical         Select whether or not the rendering is measured (Default: True).
+        precision                   Logical         Select whether or not the single and double precision time steps are compared (see Precision) (Default: False).
+
+    Output:
+        bench                       Dictionary      Dictionary with the information of the machine and the results of each geometry.
+    """
+    bench = {'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__,
+                         'platform': platform.platform(), 'cpus': os.cpu_count(), 'date': time.strftime('%Y-%m-%d %H:%M:%S')},
+             'results': {}}
+    for folder in (flds or folders):                                                # For each of the folders.
+        for reg in (regs or Sweep.regions):                                         # For each of the regions.
+            for size in (sizs or Sweep.sizes):                                      # For each of the sizes.
+                key = folder + '/' + reg + '_' + size                               # Key of the geometry.
+                bench['results'][key] = Geometry(folder, reg, size, steps, repeat, render)
+                if precision == True:                                               # If the comparison is requested.
+                    bench['results'][key]['precision'] = Precision(folder, reg, size)
+                Report(key, bench['results'][key])
+    return bench
+
+def Report(key, res):
+    """
+    Report
+    Function to print the results of one geometry.
+
+    Input:
+        key                         String          Key of the geometry.
+        res                         Dictionary      Results of the geometry.
+    """
+    cols = ['%s %.3e s %.1f MB' % (s, res[s]['time'], res[s]['memory']/2**20) for s in stages if s in res]
+    print(key, '(' + str(res['nodes']) + ' nodes):', ', '.join(cols))
+    if 'precision' in res:                                                          # If the precisions were compared.
+        pre = res['precision']
+        print('   step %.3e s (double) %.3e s (single), error %.3e (double) %.3e (single), difference %.3e' %
+              (pre['double']['step'], pre['single']['step'], pre['double']['error'], pre['single']['error'], pre['difference']))
+    sys.stdout.flush()
+
+def Save(bench, nom = None):
+    """
+    Save
+    Function to write the results as JSON.
+
+    Input:
+        bench                       Dictionary      Results of the benchmark.
+        nom                         String          Name of the file (Default: Results/Benchmarks/Benchmark.json).
+    """
+    nom = output if nom is None else nom
+    os.makedirs(os.path.dirname(nom) or '.', exist_ok = True)                       # The folder is created if needed.
+    with open(nom, 'w') as fil:
+        json.dump(bench, fil, indent = 1, sort_keys = True)
+
+def Load(nom = None):
+    """
+    Load
+    Function to read the results written with Save.
+
+    Input:
+        nom                         String          Name of the file (Default: Results/Benchmarks/Baseline.json).
+
+    Output:
+        bench                       Dictionary      Results of the benchmark, None if there is no file.
+    """
+    nom = baseline if nom is None else nom
+    try:
+        with open(nom) as fil:
+            return json.load(fil)
+    except (OSError, ValueError):                                                   # There is no baseline.
+        return None
+
+def Compare(bench, base, tol = 0.25, floor = {'time': 1e-3, 'memory': 2**20}):
+    """
+    Compare
+    Function to find the stages that are slower, or use more memory, than on the baseline.
+    A stage is a regression if it grows more than tol (relative) and more than floor (absolute), so the noise of very short stages is ignored.
+
+    Input:
+        bench                       Dictionary      Results of the benchmark.
+        base                        Dictionary      Results of the baseline.
+        tol                         Real            Relative tolerance (Default: 0.25).
+        floor                       Dictionary      Absolute tolerance for the time (s) and the memory (bytes).
+
+    Output:
+        reg                         List            List of (key, stage, metric, baseline, new) regressions.
+    """
+    reg = []                                                                        # Regressions found.
+    for key, res in bench['results'].items():                                       # For each of the geometries.
+        old = base['results'].get(key, {})                                          # Baseline of the geometry.
+        for stage in stages:                                                        # For each of the stages.
+            if stage not in res or stage not in old:                                # Only the stages on both results.
+                continue
+            for metric in ['time', 'memory']:
+                a, b = old[stage][metric], res[stage][metric]
+                if b > a*(1 + tol) and b - a > floor[metric]:
+                    reg.append((key, stage, metric, a, b))
+    return reg
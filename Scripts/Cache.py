@@ -0,0 +1,226 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+import scipy.sparse as sp
+import Scripts.Gammas as Gammas
+import Scripts.Neighbors as Neighbors
+
+# Folder of the cache, it can be changed with the GFD_CACHE environment variable
+folder = os.environ.get('GFD_CACHE', '.gfd_cache')
+
+# Maximum size of the cache in bytes
+limit = 512*2**20
+
+def Key(*items):
+    """
+    Key
+    Function to compute the key of a cache entry from the content of its inputs.
+
+    Input:
+        items                       Various         Arrays, numbers, strings or None.
+
+    Output:
+        key                         String          SHA-1 of the inputs.
+    """
+    h = hashlib.sha1()                                                              # Hash of the inputs.
+    for item in items:                                                              # For each of the inputs.
+        if isinstance(item, np.ndarray):                                            # Arrays are hashed with their type and shape.
+            a = np.ascontiguousarray(item)
+            h.update(repr((a.dtype.str, a.shape)).encode())
+            h.update(a.tobytes())
+        else:                                                                       # Any other input is hashed as text.
+            h.update(repr(item).encode())
+        h.update(b'|')                                                              # Separator between inputs.
+    return h.hexdigest()
+
+def Load(key):
+    """
+    Load
+    Function to read an entry of the cache.
+
+    Input:
+        key                         String          Key of the entry.
+
+    Output:
+        data                        Dictionary      Dictionary with the arrays of the entry, or None if there is no entry.
+    """
+    nom = os.path.join(folder, key + '.npz')                                        # Name of the entry.
+    try:
+        with np.load(nom) as fil:
+            data = {k: fil[k] for k in fil.files}                                   # The arrays are read.
+        os.utime(nom)                                                               # The entry was recently used.
+    except (OSError, ValueError):                                                   # There is no entry, or it is damaged.
+        return None
+    return data
+
+def Save(key, **data):
+    """
+    Save
+    Function to write an entry of the cache, and to remove the least recently used entries if the cache is larger than limit.
+    The entry is written to a temporal file and then renamed, so parallel runs never read an incomplete entry.
+
+    Input:
+        key                         String          Key of the entry.
+        data                        Arrays          Arrays of the entry.
+    """
+    os.makedirs(folder, exist_ok = True)                                            # The folder is created if needed.
+    fd, tmp = tempfile.mkstemp(dir = folder, suffix = '.tmp')                       # Temporal file.
+    with os.fdopen(fd, 'wb') as fil:
+        np.savez(fil, **data)                                                       # The arrays are written.
+    os.replace(tmp, os.path.join(folder, key + '.npz'))                             # The entry is renamed.
+    Evict()
+
+def Evict(size = None):
+    """
+    Evict
+    Function to remove the least recently used entries until the cache is not larger than size.
+
+    Input:
+        size                        Integer         Maximum size of the cache in bytes (Default: limit).
+    """
+    size  = limit if size is None else size                                         # Maximum size of the cache.
+    files = []                                                                      # Entries of the cache.
+    for nom in os.listdir(folder):
+        if nom.endswith('.npz'):
+            try:
+                st = os.stat(os.path.join(folder, nom))
+                files.append((st.st_mtime, st.st_size, nom))
+            except OSError:                                                         # The entry was removed by another run.
+                pass
+    total = sum(f[1] for f in files)                                                # Size of the cache.
+    for mtime, fsize, nom in sorted(files):                                         # From the least recently used entry.
+        if total <= size:
+            break
+        try:
+            os.remove(os.path.join(folder, nom))
+        except OSError:
+            pass
+        total -= fsize
+
+def Clear():
+    """
+    Clear
+    Function to remove all the entries of the cache.
+    """
+    if os.path.isdir(folder):
+        Evict(0)
+
+def Pack(K):
+    """
+    Pack
+    Function to store a sparse matrix as arrays.
+
+    Input:
+        K           m x m           Sparse          Sparse matrix.
+
+    Output:
+        data                        Dictionary      Dictionary with the CSR arrays of K.
+    """
+    K = sp.csr_matrix(K)
+    return {'data': K.data, 'indices': K.indices, 'indptr': K.indptr, 'shape': np.array(K.shape)}
+
+def Unpack(data):
+    """
+    Unpack
+    Function to rebuild a sparse matrix stored with Pack.
+
+    Input:
+        data                        Dictionary      Dictionary with the CSR arrays of K.
+
+    Output:
+        K           m x m           Sparse          CSR sparse matrix.
+    """
+    return sp.csr_matrix((data['data'], data['indices'], data['indptr']), shape = tuple(data['shape']))
+
+def Cloud(p, tt, nvec, L, triangulation = False, holes = False):
+    """
+    Cloud
+    Function to find the neighbors and the K matrix of a cloud of points, reusing them from the cache when possible.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        tt          n x 3           Array           Array with the triangulation indexes.
+        nvec                        Integer         Maximum number of neighbors.
+        L           5 x 1           Array           Array with the values of the differential operator.
+        triangulation               Logical         Select whether or not the neighbors are taken from the triangulation (Default: False).
+        holes                       Logical         Select whether or not the neighbors are only the visible ones, for clouds with holes (Default: False).
+
+    Output:
+        vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
+        K           m x m           Sparse          K Matrix with the computed Gammas.
+    """
+    tri  = np.asarray(tt) if triangulation == True or holes == True else None       # The triangles are only used if requested.
+    key  = Key('Cloud_Holes' if holes == True and triangulation == False else 'Cloud', np.asarray(p), tri, nvec, np.asarray(L, dtype = float))
+    data = Load(key)
+    if data is not None:                                                            # If the entry is on the cache.
+        return data['vec'], Unpack(data)
+    if triangulation == True:                                                       # If there are triangles available.
+        vec = Neighbors.Triangulation(p, tt, nvec)                                  # Neighbor search with the proper routine.
+    elif holes == True:                                                             # If the cloud has holes.
+        vec = Neighbors.Cloud_Holes(p, tt, nvec)                                    # Neighbor search with the proper routine.
+    else:                                                                           # If there are no triangles available.
+        vec = Neighbors.Cloud(p, nvec)                                              # Neighbor search with the proper routine.
+    K = Gammas.Cloud(p, vec, L, sparse = True)                                      # K computation with the required Gammas.
+    Save(key, vec = vec, **Pack(K))
+    return vec, K
+
+def Mesh(x, y, L):
+    """
+    Mesh
+    Function to compute the K matrix of a logically rectangular mesh, reusing it from the cache when possible.
+
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+        L           5 x 1           Array           Array with the values of the differential operator.
+
+    Output:
+        K           mn x mn         Sparse          K Matrix with the computed Gammas.
+    """
+    key  = Key('Mesh', np.asarray(x), np.asarray(y), np.asarray(L, dtype = float))  # Key of the entry.
+    data = Load(key)
+    if data is not None:                                                            # If the entry is on the cache.
+        return Unpack(data)
+    K = Gammas.Mesh(x, y, L, sparse = True)                                         # K computation that include the Gammas.
+    Save(key, **Pack(K))
+    return K
+
+def Mesh_Gammas(x, y, L):
+    """
+    Mesh_Gammas
+    Function to compute the Gammas of a logically rectangular mesh, reusing them from the cache when possible.
+
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+        L           5 x 1           Array           Array with the values of the differential operator.
+
+    Output:
+        Gamma       m-2 x n-2 x 9   Array           Gammas of the central node and its neighbors (see Gammas.Mesh_Gammas).
+    """
+    key  = Key('Mesh_Gammas', np.asarray(x), np.asarray(y), np.asarray(L, dtype = float))
+    data = Load(key)
+    if data is not None:                                                            # If the entry is on the cache.
+        return data['Gamma']
+    Gamma = Gammas.Mesh_Gammas(x, y, L)                                             # Gamma values are found.
+    Save(key, Gamma = Gamma)
+    return Gamma
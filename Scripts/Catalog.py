@@ -0,0 +1,161 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+
+Usage:
+    python -m Scripts.Catalog
+"""
+
+import os
+import glob
+import json
+import numpy as np
+from scipy.io import loadmat
+
+# Folder with the .mat files
+source = 'Data'
+
+# Folder with the imported geometries
+store = os.path.join('Data', 'Store')
+
+def Import(src = None, dst = None):
+    """
+    Import
+    Function to convert all the Data/<folder>/<REG>_<size>.mat files into .npy files that can be memory-mapped.
+    The triangles are stored 0-based, and a catalog.json index is written with the size and the bounding box of each geometry.
+    Files that did not change since the last import are skipped.
+
+    Input:
+        src                         String          Folder with the .mat files (Default: Data).
+        dst                         String          Folder for the imported geometries (Default: Data/Store).
+
+    Output:
+        catalog                     Dictionary      Catalog with an entry for each geometry.
+    """
+    src     = source if src is None else src                                        # Folder with the .mat files.
+    dst     = store if dst is None else dst                                         # Folder for the imported geometries.
+    catalog = Index(dst)                                                            # Catalog of the previous import.
+
+    for nom in sorted(glob.glob(os.path.join(src, '*', '*_*.mat'))):                # For each of the .mat files.
+        folder = os.path.basename(os.path.dirname(nom))                             # Folder of the geometry (Clouds, Holes, Meshes).
+        reg, size = os.path.splitext(os.path.basename(nom))[0].split('_', 1)        # Region and size.
+        key   = folder + '/' + reg + '_' + size                                     # Key of the geometry.
+        mtime = os.path.getmtime(nom)                                               # Modification time of the .mat file.
+        if key in catalog and catalog[key]['mtime'] == mtime:                       # If the geometry did not change.
+            continue
+
+        mat   = loadmat(nom)                                                        # All data is loaded from the file.
+        entry = {'folder': folder, 'region': reg, 'size': size, 'mtime': mtime, 'files': {}}
+        if 'x' in mat:                                                              # For logically rectangular meshes.
+            arrays = {'x': mat['x'], 'y': mat['y']}
+            x, y   = mat['x'], mat['y']
+            entry['nodes'] = int(x.size)                                            # The total number of nodes.
+            entry['shape'] = list(x.shape)                                          # The number of nodes in x and y.
+        else:                                                                       # For clouds of points and triangulations.
+            tt = np.asarray(mat['tt'], dtype = np.int64)                            # Triangles of the cloud.
+            if tt.min() == 1:                                                       # If the triangles are 1-based.
+                tt = tt - 1                                                         # The triangles are 0-based.
+            arrays = {'p': np.asarray(mat['p'], dtype = float), 'tt': tt}
+            x, y   = mat['p'][:,0], mat['p'][:,1]
+            entry['nodes']     = int(len(mat['p'][:,0]))                            # The total number of nodes.
+            entry['boundary']  = int(np.sum(mat['p'][:,2] == 1))                    # The number of boundary nodes.
+            entry['triangles'] = int(len(tt[:,0]))                                  # The number of triangles.
+        entry['bbox'] = [float(x.min()), float(x.max()), float(y.min()), float(y.max())]
+
+        os.makedirs(os.path.join(dst, folder), exist_ok = True)                     # The folder is created if needed.
+        for name, a in arrays.items():                                              # For each of the arrays.
+            fil = folder + '/' + reg + '_' + size + '_' + name + '.npy'             # Name of the array, relative to the store.
+            np.save(os.path.join(dst, fil), np.ascontiguousarray(a))
+            entry['files'][name] = fil
+        catalog[key] = entry
+
+    with open(os.path.join(dst, 'catalog.json'), 'w') as fil:                       # The catalog is written.
+        json.dump(catalog, fil, indent = 1, sort_keys = True)
+    return catalog
+
+def Index(dst = None):
+    """
+    Index
+    Function to read the catalog of the imported geometries.
+
+    Input:
+        dst                         String          Folder with the imported geometries (Default: Data/Store).
+
+    Output:
+        catalog                     Dictionary      Catalog with an entry for each geometry, empty if there is no catalog.
+    """
+    dst = store if dst is None else dst                                             # Folder with the imported geometries.
+    try:
+        with open(os.path.join(dst, 'catalog.json')) as fil:
+            return json.load(fil)
+    except (OSError, ValueError):                                                   # There is no catalog.
+        return {}
+
+def Load(folder, reg, size, dst = None, catalog = None):
+    """
+    Load
+    Function to load a geometry. The arrays are memory-mapped from the store when the geometry was imported, and read from the .mat file otherwise.
+
+    Input:
+        folder                      String          Folder of the geometry (Clouds, Holes or Meshes).
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        dst                         String          Folder with the imported geometries (Default: Data/Store).
+        catalog                     Dictionary      Catalog of the geometries (Default: read from dst).
+
+    Output:
+        geo                         Dictionary      Dictionary with p and tt (0-based) for clouds, or x and y for meshes.
+    """
+    dst     = store if dst is None else dst                                         # Folder with the imported geometries.
+    catalog = Index(dst) if catalog is None else catalog                            # Catalog of the geometries.
+    entry   = catalog.get(folder + '/' + reg + '_' + size)                          # Entry of the geometry.
+    nom     = os.path.join(source, folder, reg + '_' + size + '.mat')               # Name of the .mat file.
+    if entry is not None and (not os.path.exists(nom) or os.path.getmtime(nom) == entry['mtime']):
+        return {k: np.load(os.path.join(dst, f), mmap_mode = 'r') for k, f in entry['files'].items()}
+
+    mat = loadmat(nom)                                                              # All data is loaded from the file.
+    if 'x' in mat:                                                                  # For logically rectangular meshes.
+        return {'x': mat['x'], 'y': mat['y']}
+    tt = mat['tt']                                                                  # Triangles of the cloud.
+    if tt.min() == 1:                                                               # If the triangles are 1-based.
+        tt -= 1                                                                     # The triangles are 0-based.
+    return {'p': mat['p'], 'tt': tt}
+
+def Nodes(folder, reg, size, dst = None, catalog = None):
+    """
+    Nodes
+    Function to find the number of nodes of a geometry, from the catalog when possible.
+
+    Input:
+        folder                      String          Folder of the geometry (Clouds, Holes or Meshes).
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        dst                         String          Folder with the imported geometries (Default: Data/Store).
+        catalog                     Dictionary      Catalog of the geometries (Default: read from dst).
+
+    Output:
+        m                           Integer         The total number of nodes.
+    """
+    catalog = Index(dst) if catalog is None else catalog                            # Catalog of the geometries.
+    entry   = catalog.get(folder + '/' + reg + '_' + size)                          # Entry of the geometry.
+    if entry is not None:                                                           # If the geometry was imported.
+        return entry['nodes']
+    geo = Load(folder, reg, size, dst, catalog)                                     # The geometry is loaded.
+    return int(geo['x'].size) if 'x' in geo else len(geo['p'][:,0])
+
+if __name__ == '__main__':
+    catalog = Import()
+    print(len(catalog), 'geometries on', store)
@@ -0,0 +1,314 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import traceback
+import threading
+import multiprocessing as mp
+import multiprocessing.connection
+from multiprocessing import shared_memory
+import numpy as np
+import scipy.sparse as sp
+import Scripts.Gammas as Gammas
+import Scripts.Neighbors as Neighbors
+import Scripts.Profile as Profile
+import Diffusion_2D
+
+def Bisection(p, parts):
+    """
+    Bisection
+    Function to split a cloud of points in parts with recursive coordinate bisection.
+    Each set of nodes is cut across its longest direction, so the parts have the same number of nodes (up to one) and short interfaces.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        parts                       Integer         Number of parts.
+
+    Output:
+        part        m x 1           Array           Array with the part of each node, from 0 to parts-1.
+    """
+    m     = len(p[:,0])                                                             # The total number of nodes.
+    part  = np.zeros(m, dtype = int)                                                # Part of each node.
+    stack = [(np.arange(m), 0, parts)]                                              # Sets of nodes to be split, with their first part and number of parts.
+    while len(stack) > 0:                                                           # While there are sets to be split.
+        idx, first, k = stack.pop()
+        if k == 1:                                                                  # If the set is a single part.
+            part[idx] = first
+            continue
+        xy = p[idx, 0:2]
+        ax = np.argmax(xy.max(axis = 0) - xy.min(axis = 0))                         # Longest direction of the set.
+        o  = np.argsort(xy[:,ax], kind = 'stable')                                  # Nodes sorted on that direction.
+        k0 = k//2                                                                   # Parts on the first half.
+        c  = len(idx)*k0//k                                                         # Nodes on the first half.
+        stack.append((idx[o[:c]], first, k0))
+        stack.append((idx[o[c:]], first + k0, k - k0))
+    return part
+
+def Halo(p, vec, own):
+    """
+    Halo
+    Function to find the local problem of one part: its own nodes and the halo of neighbors owned by other parts.
+    The local nodes are kept in the global order, so the local products add the same terms in the same order as the global ones.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
+        own         n x 1           Array           Array with the sorted nodes of the part.
+
+    Output:
+        dom                         Dictionary      Dictionary with the local problem:
+                                                        'own', 'loc': global indexes of the own and the local (own and halo) nodes.
+                                                        'ow': position of the own nodes among the local ones.
+                                                        'p', 'vec': local nodes and neighbors; the halo nodes are flagged as boundary, so they have no Gammas.
+                                                        'bnd': position of the own boundary nodes among the own ones.
+    """
+    nb        = vec[own]                                                            # Neighbors of the own nodes.
+    loc       = np.union1d(own, nb[nb >= 0])                                        # Own and halo nodes, sorted.
+    ow        = np.searchsorted(loc, own)                                           # Position of the own nodes.
+    pl        = p[loc].copy()
+    halo      = np.ones(len(loc), dtype = bool)
+    halo[ow]  = False
+    pl[halo,2] = 1                                                                  # Halo nodes have no Gammas.
+    vl        = np.zeros([len(loc), vec.shape[1]], dtype = int) - 1                 # Local neighbors.
+    vl[ow]    = np.where(nb >= 0, np.searchsorted(loc, np.maximum(nb, 0)), -1)      # Neighbors of the own nodes, with local indexes.
+    bnd       = np.where(p[own,2] == 1)[0]                                          # Own boundary nodes.
+    return {'own': own, 'loc': loc, 'ow': ow, 'p': pl, 'vec': vl, 'bnd': bnd}
+
+def Shared(shape, name = None):
+    """
+    Shared
+    Function to create, or to attach to, an array on shared memory.
+
+    Input:
+        shape                       Tuple           Shape of the array.
+        name                        String          Name of an existing block of shared memory (Default: None, a new block is created).
+
+    Output:
+        shm                         SharedMemory    Block of shared memory; it must be closed, and unlinked by the process that created it.
+        a           shape           Array           Array of doubles on the block.
+    """
+    size = max(int(np.prod(shape))*8, 1)                                            # Size in bytes.
+    if name is None:                                                                # If a new block is requested.
+        shm = shared_memory.SharedMemory(create = True, size = size)
+    else:                                                                           # If the block already exists.
+        shm = shared_memory.SharedMemory(name = name)
+    return shm, np.ndarray(shape, dtype = np.float64, buffer = shm.buf)
+
+def Worker(dom, f, v, L, T, sav, names, shape, barrier):
+    """
+    Worker
+    Function executed by each process of the domain-decomposed solver.
+    The process computes the Gammas of its own nodes, and on each time step it reads its local nodes from the shared solution, computes the
+    new time level of its own nodes with their boundary conditions, and waits for the other processes.
+    If something fails, the barrier is broken so the other processes stop too.
+
+    Input:
+        dom                         Dictionary      Local problem of the part (see Halo).
+        f           B x 1           List            List of functions with the boundary condition of each case.
+        v                           Real            Diffusion coefficient.
+        L           5 x 1           Array           Array with the values of the differential operator, for dt = 1.
+        T           t x 1           Array           Array with the time discretization.
+        sav         s x 1           Array           Array with the indexes of the stored time levels.
+        names                       List            Names of the shared blocks with the two time levels and u_ap.
+        shape                       Tuple           (m, B) shape of each time level.
+        barrier                     Barrier         Barrier shared by all the processes.
+    """
+    blocks = []
+    U = UA = None
+    try:
+        shm, U  = Shared((2,) + shape, names[0])                                    # The previous and the new time levels.
+        blocks.append(shm)
+        shm, UA = Shared(shape + (len(sav),), names[1])                             # u_ap.
+        blocks.append(shm)
+
+        # Local operator
+        own, loc, ow, bnd = dom['own'], dom['loc'], dom['ow'], dom['bnd']
+        n  = len(own)                                                               # Number of own nodes.
+        K  = T[1]*Gammas.Cloud(dom['p'], dom['vec'], L, sparse = True)[ow]          # Gammas of the own nodes, scaled with dt.
+        I  = sp.csr_matrix((np.ones(n), (np.arange(n), ow)), shape = (n, len(loc))) # Own part of the identity.
+        K2 = (I + K).tocsr()                                                        # Explicit formulation of the own rows.
+        gb = Diffusion_2D.Boundaries(f, dom['p'][ow[bnd],0], dom['p'][ow[bnd],1], T, v)
+        barrier.wait()                                                              # Every process is ready.
+
+        # Time steps
+        s = int(np.searchsorted(sav, 1))                                            # The initial condition is already stored.
+        for k in np.arange(1, len(T)):                                              # For each of the time steps.
+            un      = K2@U[(k-1)%2][loc]                                            # New time level of the own nodes, from the local nodes.
+            un[bnd] = next(gb)                                                      # The boundary condition is assigned.
+            U[k%2][own] = un
+            if s < len(sav) and sav[s] == k:                                        # If the time level is requested.
+                UA[own,:,s] = un
+                s += 1
+            barrier.wait()                                                          # The whole time level is known.
+    except threading.BrokenBarrierError:                                            # Another process failed.
+        raise SystemExit(1)
+    except BaseException:                                                           # This process failed.
+        traceback.print_exc()
+        barrier.abort()
+        raise SystemExit(1)
+    finally:
+        U = UA = None                                                               # The arrays must be released before the blocks.
+        for shm in blocks:
+            shm.close()
+
+def Wait(procs, barrier):
+    """
+    Wait
+    Function to wait for the processes of the domain-decomposed solver.
+    As soon as a process ends with an error, or is killed, the barrier is broken, so the other processes stop instead of waiting for it forever.
+
+    Input:
+        procs                       List            List with the processes.
+        barrier                     Barrier         Barrier shared by all the processes.
+    """
+    live = list(procs)                                                              # Processes still running.
+    while len(live) > 0:
+        mp.connection.wait([proc.sentinel for proc in live])                        # Until one of them ends.
+        for proc in [proc for proc in live if proc.exitcode is not None]:           # For each process that ended.
+            live.remove(proc)
+            if proc.exitcode != 0:                                                  # If it failed or it was killed.
+                barrier.abort()                                                     # The other processes stop.
+
+def Cloud(p, f, v, t, parts = 2, triangulation = False, tt = [], save = None, tf = 1, stats = None, holes = False):
+    """
+    2D Diffusion Equation implemented on Unstructured Clouds of Points, solved on several processes.
+
+    The cloud is split in parts with recursive coordinate bisection (see Bisection), and each part is solved by its own process with the explicit scheme.
+    The outputs are the same as the ones of Diffusion_2D.Cloud with the explicit scheme.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        f                           Function        Function declared with the boundary condition, evaluated on arrays as f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps to be considered.
+        parts                       Integer         Number of parts, and of processes (Default: 2).
+        triangulation               Logical         Select whether or not there is a triangulation available (Default: False).
+        tt          m x 3           Array           Array with the triangulation indexes.
+        save                        Various         Time levels to be stored (see Diffusion_2D.Schedule).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run (see Cloud_Ensemble).
+        holes                       Logical         Select whether or not the cloud has holes, described by the triangles tt (Default: False).
+
+    Output:
+        u_ap        m x s           Array           Array with the approximation computed by the routine on the s stored time levels.
+        u_ex        m x s           Array           Array with the theoretical solution on the s stored time levels.
+        vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
+    """
+
+    u_ap, u_ex, vec = Cloud_Ensemble(p, [f], v, t, parts, triangulation, tt, save, tf, stats, holes)
+    return u_ap[:,0,:], u_ex[:,0,:], vec
+
+def Cloud_Ensemble(p, f, v, t, parts = 2, triangulation = False, tt = [], save = None, tf = 1, stats = None, holes = False):
+    """
+    2D Diffusion Equation implemented on Unstructured Clouds of Points, for several cases at once, solved on several processes.
+
+    The neighbors are found on the whole cloud and the cloud is split in parts (see Bisection).
+    Each process computes the Gammas of its own nodes and their explicit time steps.
+    The time levels are kept on shared memory: on each step every process reads the halo values of its neighbors from the previous level,
+    writes its own nodes on the new one, and waits on a barrier for the others.
+    The functions f must be usable on the processes (defined on a module, unless the processes are forked).
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        f           B x 1           List            List of functions with the boundary condition of each case, evaluated on arrays as f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps to be considered.
+        parts                       Integer         Number of parts, and of processes (Default: 2).
+        triangulation               Logical         Select whether or not there is a triangulation available (Default: False).
+        tt          m x 3           Array           Array with the triangulation indexes.
+        save                        Various         Time levels to be stored (see Diffusion_2D.Schedule).
+        tf                          Real            Final time (Default: 1).
+        stats                       Dictionary      Dictionary filled with information about the run.
+                                                        't' and 'dt': time discretization.
+                                                        'time': wall time of each stage ('neighbors', 'partition', 'steps', 'exact'); 'steps' includes the Gammas of the parts.
+                                                        'parts': number of own and halo nodes of each part.
+        holes                       Logical         Select whether or not the cloud has holes, described by the triangles tt (Default: False).
+
+    Output:
+        u_ap        m x B x s       Array           Array with the approximation of each case on the s stored time levels.
+        u_ex        m x B x s       Array           Array with the theoretical solution of each case on the s stored time levels.
+        vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
+    """
+
+    # Variable initialization
+    m    = len(p[:,0])                                                              # The total number of nodes is calculated.
+    nvec = 8                                                                        # Maximum number of neighbors for each node.
+    B    = len(f)                                                                   # The number of cases.
+    L    = np.vstack([[0], [0], [2*v], [0], [2*v]])                                 # The values of the differential operator are assigned, for dt = 1.
+
+    # Neighbor search for all the nodes.
+    with Profile.Stage(stats, 'neighbors'):
+        if triangulation == True:                                                   # If there are triangles available.
+            vec = Neighbors.Triangulation(p, tt, nvec)                              # Neighbor search with the proper routine.
+        elif holes == True:                                                         # If the cloud has holes.
+            vec = Neighbors.Cloud_Holes(p, tt, nvec)                                # Neighbor search with the proper routine.
+        else:                                                                       # If there are no triangles available.
+            vec = Neighbors.Cloud(p, nvec)                                          # Neighbor search with the proper routine.
+
+    # Partition of the cloud
+    with Profile.Stage(stats, 'partition'):
+        part = Bisection(p, parts)                                                  # Part of each node.
+        doms = [Halo(p, vec, np.where(part == r)[0]) for r in np.arange(parts)]     # Local problem of each part.
+    if stats is not None:                                                           # If the information is requested.
+        stats['parts'] = {'nodes': [len(d['own']) for d in doms], 'halo': [len(d['loc']) - len(d['own']) for d in doms]}
+
+    # Time discretization
+    t   = Diffusion_2D.Steps(None, t, tf, stats = stats)                            # The number of time steps.
+    T   = np.linspace(0,tf,t)                                                       # Time discretization.
+    sav = Diffusion_2D.Schedule(T, save)                                            # Time levels to be stored.
+
+    # Shared time levels
+    blocks = []
+    procs  = []
+    U = UA = None
+    try:
+        shm, U  = Shared((2, m, B))                                                 # The previous and the new time levels.
+        blocks.append(shm)
+        shm, UA = Shared((m, B, len(sav)))                                          # u_ap.
+        blocks.append(shm)
+        with Profile.Stage(stats, 'exact'):
+            U[0] = Diffusion_2D.Exact_Ensemble(f, p[:,0], p[:,1], T[0:1], v)[..., 0]  # The initial condition is assigned for all the cases.
+        if len(sav) > 0 and sav[0] == 0:                                            # If the initial condition is requested.
+            UA[...,0] = U[0]
+
+        # Time steps on the processes
+        barrier = mp.Barrier(parts)
+        names   = [b.name for b in blocks]
+        procs   = [mp.Process(target = Worker, args = (d, f, v, L, T, sav, names, (m, B), barrier)) for d in doms]
+        with Profile.Stage(stats, 'steps'):
+            for proc in procs:
+                proc.start()
+            Wait(procs, barrier)
+        if any(proc.exitcode != 0 for proc in procs):                               # If any of the processes failed.
+            raise RuntimeError('The domain-decomposed solver failed on ' + str(sum(proc.exitcode != 0 for proc in procs)) + ' of ' + str(parts) + ' processes.')
+        u_ap = UA.copy()                                                            # The stored time levels.
+    finally:
+        for proc in procs:                                                          # If the master was interrupted.
+            if proc.is_alive():
+                proc.terminate()
+            if proc.pid is not None:
+                proc.join()
+        U = UA = None                                                               # The arrays must be released before the blocks.
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    # Theoretical Solution
+    with Profile.Stage(stats, 'exact'):
+        u_ex = Diffusion_2D.Exact_Ensemble(f, p[:,0], p[:,1], T[sav], v)            # Only on the stored time levels.
+
+    return u_ap, u_ex, vec
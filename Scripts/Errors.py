@@ -13,7 +13,7 @@ Date:
     November, 2022.
 
 Last Modification:
-    March, 2023.
+    October, 2026.
 """
 
 import numpy as np
@@ -22,18 +22,86 @@ def PolyArea(x,y):
     """
     PolyArea
     Function to calculate the area of a polygon defined by the vertices whose coordinates are stored in $x$ and $y$.
+    Several polygons with the same number of vertices can be computed at once; the vertices are on the last axis.
     
     Input:
-        x           m x n           Array           Array with the coordinates in x of the vertices of the polygon.
-        y           m x n           Array           Array with the coordinates in y of the vertices of the polygon.
+        x           ... x nv        Array           Array with the coordinates in x of the vertices of the polygons.
+        y           ... x nv        Array           Array with the coordinates in y of the vertices of the polygons.
     
     Output:
-        area                        Real            Area of the polygon.
+        area        ...             Real            Area of the polygons.
     """
-    area = 0.5*np.abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+    area = 0.5*np.abs(np.sum(x*np.roll(y, 1, axis = -1) - y*np.roll(x, 1, axis = -1), axis = -1))
 
     return area
 
+def Mesh_Area(x, y):
+    """
+    Mesh_Area
+    Function to compute the area associated to each node of a logically rectangular mesh.
+    The polygon used to calculate the area is the one defined by all the immediate neighbors of the central node.
+    
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+    
+    Output:
+        area        m x n           Array           Area of each node, zero on the boundary.
+    """
+    m  = len(x[:,0])                                                                # The number of nodes in x.
+    n  = len(x[0,:])                                                                # The number of nodes in y.
+    si = [2, 2, 1, 0, 0, 0, 1, 2]                                                   # Position on x of the vertices, (i+1,j), (i+1,j+1), ..., (i+1,j-1).
+    sj = [1, 2, 2, 2, 1, 0, 0, 0]                                                   # Position on y of the vertices.
+    px = np.stack([x[a:m-2+a, b:n-2+b] for a, b in zip(si, sj)], axis = -1)         # The x-values of all the polygons.
+    py = np.stack([y[a:m-2+a, b:n-2+b] for a, b in zip(si, sj)], axis = -1)         # The y-values of all the polygons.
+    area = np.zeros([m,n])                                                          # area initialization with zeros.
+    area[1:m-1, 1:n-1] = PolyArea(px, py)                                           # Area computation.
+    return area
+
+def Cloud_Area(p, vec):
+    """
+    Cloud_Area
+    Function to compute the area associated to each node of a triangulation or an unstructured cloud of points.
+    The polygon used to calculate the area is the one defined by all the immediate neighbors of the central node.
+    Polygons with fewer than nvec vertices are padded with their last vertex, which does not change their area.
+    
+    Input:
+        p           m x 2           Array           Array with the coordinates of the nodes.
+        vec         m x nvec        Array           Array with the correspondence of the nvec neighbors of each node.
+    
+    Output:
+        area        m x 1           Array           Area of each node.
+    """
+    m    = len(p[:,0])                                                              # The total number of nodes is calculated.
+    nv   = np.sum(vec != -1, axis = 1)                                              # The number of neighbors of each node.
+    last = vec[np.arange(m), np.maximum(nv - 1, 0)]                                 # The last neighbor of each node.
+    vec1 = np.where(np.arange(len(vec[0,:])) < nv[:, np.newaxis], vec, last[:, np.newaxis])
+    area = PolyArea(p[vec1, 0], p[vec1, 1])                                         # Area computation.
+    area[nv == 0] = 0                                                               # Nodes without neighbors have no area.
+    return area
+
+def Weighted(area, u_ap, u_ex, nb = 1024):
+    """
+    Weighted
+    Function to compute the mean square error weighted with the area of each node, on blocks of nb time steps.
+    
+    Input:
+        area        m x 1           Array           Area of each node (or m x n for meshes).
+        u_ap        m x t           Array           Array with the computed solution (or m x n x t for meshes).
+        u_ex        m x t           Array           Array with the theoretical solution (or m x n x t for meshes).
+        nb                          Integer         Number of time steps on each block (Default: 1024).
+    
+    Output:
+        er          t x 1           Array           Mean square error computed on each time step.
+    """
+    w  = area.reshape(-1)                                                           # Area of each node.
+    t  = u_ap.shape[-1]                                                             # The number of time steps is found.
+    er = np.zeros(t)                                                                # er initialization with zeros.
+    for k in np.arange(0, t, nb):                                                   # For each block of time steps.
+        d = (u_ap[..., k:k+nb] - u_ex[..., k:k+nb]).reshape(len(w), -1)             # Difference between both solutions.
+        er[k:k+nb] = np.sqrt(w@(d*d))                                               # Mean square error computation.
+    return er
+
 def Mesh(x, y, u_ap, u_ex):
     """
     Mesh_Transient
@@ -49,27 +117,7 @@ def Mesh(x, y, u_ap, u_ex):
     Output:
         er          t x 1           Array           Mean square error computed on each time step.
     """
-    m = len(x[:,0])                                                                 # The number of nodes in x.
-    n = len(x[0,:])                                                                 # The number of nodes in y.
-    t    = len(u_ap[0,0,:])                                                         # The number of time steps is found.
-    er   = np.zeros(t)                                                              # er initialization with zeros.
-    area = np.zeros([m,n])                                                          # area initialization with zeros.
-
-    for i in np.arange(1,m-1):                                                      # For each of the nodes on the x axis.
-        for j in np.arange(1,n-1):                                                  # For each of the nodes on the y axis.
-            px = np.array([x[i+1, j], x[i+1, j+1], x[i, j+1], x[i-1, j+1], \
-                           x[i-1, j], x[i-1, j-1], x[i, j-1], x[i+1, j-1]])         # The x-values of the polygon are stored.
-            py = np.array([y[i+1, j], y[i+1, j+1], y[i, j+1], y[i-1, j+1], \
-                           y[i-1, j], y[i-1, j-1], y[i, j-1], y[i+1, j-1]])         # The y-values of the polygon are stored.
-            area[i,j] = PolyArea(px,py)                                             # Area computation.
-
-    for k in np.arange(t):                                                          # For each time step.
-        for i in np.arange(1,m-1):                                                  # For each of the nodes on the x axis.
-            for j in np.arange(1,n-1):                                              # For each of the nodes on the y axis.
-                er[k] = er[k] + area[i,j]*(u_ap[i,j,k] - u_ex[i,j,k])**2            # Mean square error computation.
-
-        er[k] = np.sqrt(er[k])                                                      # The square root is computed.
-    
+    er = Weighted(Mesh_Area(x, y), u_ap, u_ex)                                      # Mean square error computation.
     return er
 
 def Cloud(p, vec, u_ap, u_ex):
@@ -87,26 +135,66 @@ def Cloud(p, vec, u_ap, u_ex):
     Output:
         er          t x 1           Array           Mean square error computed on each time step.
     """
+    er = Weighted(Cloud_Area(p, vec), u_ap, u_ex)                                   # Mean square error computation.
+    return er
 
-    m    = len(p[:,0])                                                              # The total number of nodes is calculated.
-    t    = len(u_ap[0,:])                                                           # The number of time steps is found.
-    er   = np.zeros(t)                                                              # er initialization with zeros.
-    area = np.zeros(m)                                                              # area initialization with zeros.
+def Stream(area, x, y, f, v, t):
+    """
+    Stream
+    Function to compute the mean square error while the solver runs, without storing the solutions.
+    The returned callback is passed to the solvers, and er is filled on each time level.
+    
+    Input:
+        area        m x 1           Array           Area of each node (or m x n for meshes).
+        x           m x 1           Array           Array with the coordinates in x of the nodes (or m x n for meshes).
+        y           m x 1           Array           Array with the coordinates in y of the nodes (or m x n for meshes).
+        f                           Function        Function with the theoretical solution, f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps.
+    
+    Output:
+        callback                    Function        Function called as callback(k, T[k], u) by the solvers.
+        er          t x 1           Array           Mean square error on each time step, filled by callback.
+    """
+    er = np.zeros(t)                                                                # er initialization with zeros.
 
-    for i in np.arange(m):
-        nvec = sum(vec[i,:] != -1)                                                  # The number of neighbors of the central node.
-        polix = np.zeros([nvec])                                                    # The x-values of the polygon are stored.
-        poliy = np.zeros([nvec])                                                    # The y-values of the polygon are stored.
-        for j in np.arange(nvec):                                                   # For each of the neighbor nodes.
-            vec1 = int(vec[i,j])                                                    # The index of the node is found.
-            polix[j] = p[vec1,0]                                                    # The x coordinate of the node is stored.
-            poliy[j] = p[vec1,1]                                                    # The y coordinate of the node is stored.
-        area[i] = PolyArea(polix, poliy)                                            # Area computation.
+    def callback(k, tk, u):
+        d     = u - f(x, y, tk, v)                                                  # Difference between both solutions.
+        er[k] = np.sqrt(np.sum(area*d*d))                                           # Mean square error computation.
+    return callback, er
 
-    for k in np.arange(t):                                                          # For each time step.
-        for i in np.arange(m):                                                      # For each of the nodes.
-            er[k] = er[k] + area[i]*(u_ap[i,k] - u_ex[i,k])**2                      # Mean square error computation.
+def Mesh_Stream(x, y, f, v, t):
+    """
+    Mesh_Stream
+    Function to compute the error in a logically rectangular mesh while the solver runs (see Stream).
+    
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+        f                           Function        Function with the theoretical solution, f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps.
+    
+    Output:
+        callback                    Function        Function called as callback(k, T[k], u) by Diffusion_2D.Mesh.
+        er          t x 1           Array           Mean square error on each time step, filled by callback.
+    """
+    return Stream(Mesh_Area(x, y), x, y, f, v, t)
 
-        er[k] = np.sqrt(er[k])                                                      # The square root is computed.
+def Cloud_Stream(p, vec, f, v, t):
+    """
+    Cloud_Stream
+    Function to compute the error in a triangulation or an unstructured cloud of points while the solver runs (see Stream).
     
-    return er
\ No newline at end of file
+    Input:
+        p           m x 2           Array           Array with the coordinates of the nodes.
+        vec         m x nvec        Array           Array with the correspondence of the nvec neighbors of each node.
+        f                           Function        Function with the theoretical solution, f(x, y, t, v).
+        v                           Real            Diffusion coefficient.
+        t                           Integer         Number of time steps.
+    
+    Output:
+        callback                    Function        Function called as callback(k, T[k], u) by Diffusion_2D.Cloud.
+        er          t x 1           Array           Mean square error on each time step, filled by callback.
+    """
+    return Stream(Cloud_Area(p, vec), p[:,0], p[:,1], f, v, t)
@@ -13,12 +13,13 @@ Date:
     November, 2022.
 
 Last Modification:
-    March, 2023.
+    October, 2026.
 """
 
 import numpy as np
+import scipy.sparse as sp
 
-def Cloud(p, vec, L):
+def Cloud(p, vec, L, sparse = False):
     """
     2D Clouds of Points Gammas Computation.
      
@@ -28,40 +29,34 @@ def Cloud(p, vec, L):
         p           m x 3           Array           Array with the coordinates of the nodes and a flag for the boundary.
         vec         m x nvec        Array           Array with the correspondence of the 'nvec' neighbors of each node.
         L           5 x 1           Array           Array with the values of the differential operator.
+        sparse                      Logical         Select whether or not K is assembled as a sparse matrix.
+                                                        True: K is a CSR sparse matrix.
+                                                        False: K is a dense array (Default).
      
      Output:
         K           m x m           Array           K Matrix with the computed Gammas.
     """
     # Variable initialization
     nvec  = len(vec[0,:])                                                           # The maximum number of neighbors.
+    inner = np.where(p[:,2] == 0)[0]                                                # Only the inner nodes have Gammas.
     m     = len(p[:,0])                                                             # The total number of nodes.
-    K     = np.zeros([m,m])                                                         # K initialization with zeros.
-    
-    # Gammas computation and Matrix assembly
-    for i in np.arange(m):                                                          # For each of the nodes.
-        if p[i,2] == 0:                                                             # If the node is an inner node.
-            nvec = sum(vec[i,:] != -1)                                              # The total number of neighbors of the node.
-            dx   = np.zeros([nvec])                                                 # dx initialization with zeros.
-            dy   = np.zeros([nvec])                                                 # dy initialization with zeros.
-            for j in np.arange(nvec):                                               # For each of the neighbor nodes.
-                vec1  = int(vec[i, j])                                              # The neighbor index is found.
-                dx[j] = p[vec1, 0] - p[i,0]                                         # dx is computed.
-                dy[j] = p[vec1, 1] - p[i,1]                                         # dy is computed.
-            M     = np.vstack([[dx], [dy], [dx**2], [dx*dy], [dy**2]])              # M matrix is assembled.
-            M     = np.linalg.pinv(M)                                               # The pseudoinverse of matrix M.
-            YY    = M@L                                                             # M*L computation.
-            Gamma = np.vstack([-sum(YY), YY]).transpose()                           # Gamma values are found.
-            K[i,i] = Gamma[0,0]                                                     # The corresponding Gamma for the central node.
-            for j in np.arange(nvec):                                               # For each of the neighbor nodes.
-                K[i, vec[i,j]] = Gamma[0,j+1]                                       # The corresponding Gamma for the neighbor node.
-            
-        if p[i,2] == 1:                                                             # If the node is in the boundary.
-            K[i,i] = 0                                                              # Central node weight is equal to 0.
-            for j in np.arange(nvec):                                               # For each of the neighbor nodes.
-                K[i, vec[i,j]] = 0                                                  # Neighbor node weight is equal to 0.
+    nv    = np.sum(vec[inner,:] != -1, axis = 1)                                    # The total number of neighbors of each node.
+    mask  = np.arange(nvec) < nv[:, np.newaxis]                                     # Valid neighbors of each node.
+    vec1  = np.where(mask, vec[inner,:], inner[:, np.newaxis])                      # Missing neighbors are replaced by the central node.
+
+    # Gammas computation
+    dx    = p[vec1, 0] - p[inner, 0][:, np.newaxis]                                 # dx is computed for all the stencils.
+    dy    = p[vec1, 1] - p[inner, 1][:, np.newaxis]                                 # dy is computed for all the stencils.
+    Gamma = Weights(dx, dy, L, mask)                                                # Gamma values are found.
+
+    # Matrix assembly
+    keep  = np.hstack([np.ones([len(inner), 1], dtype = bool), mask])               # Central node and valid neighbors.
+    rows  = np.repeat(inner, nvec+1).reshape(-1, nvec+1)                            # The row of the central node.
+    cols  = np.hstack([inner[:, np.newaxis], vec1])                                 # The central node and its neighbors.
+    K     = Assemble(rows[keep], cols[keep], Gamma[keep], m, sparse)                # Boundary nodes keep rows of zeros.
     return K
 
-def Mesh(x, y, L):
+def Mesh(x, y, L, sparse = False):
     """
     2D Logically Rectangular Meshes Gammas Computation.
      
@@ -71,49 +66,98 @@ def Mesh(x, y, L):
         x           m x n           Array           Array with the coordinates in x of the nodes.
         y           m x n           Array           Array with the coordinates in y of the nodes.
         L           5 x 1           Array           Array with the values of the differential operator.
+        sparse                      Logical         Select whether or not K is assembled as a sparse matrix.
+                                                        True: K is a CSR sparse matrix.
+                                                        False: K is a dense array (Default).
      
      Output:
-        K           m x m           Array           K Matrix with the computed Gammas.
+        K           mn x mn         Array           K Matrix with the computed Gammas.
     """
     # Variable initialization
     m  = len(x[:,0])                                                                # The number of nodes in x.
     n  = len(x[0,:])                                                                # The number of nodes in y.
-    K  = np.zeros([(m)*(n), (m)*(n)])                                               # K initialization with zeros.
+    offs = np.array([0, -1-m, -m, 1-m, -1, 1, -1+m, m, 1+m])                        # Position of each Gamma relative to the central node.
+
+    # Gammas computation
+    Gamma = Mesh_Gammas(x, y, L).reshape(-1, 9)                                     # Gamma values for all the inner nodes.
 
-    # Gammas computation and Matrix assembly
-    for i in np.arange(1,m-1):                                                      # For each of the inner nodes on x.
-        for j in np.arange(1,n-1):                                                  # For each of the inner nodes on y.
-            u  = np.array(x[i-1:i+2, j-1:j+2])                                      # u is formed with the x-coordinates of the stencil.
-            v  = np.array(y[i-1:i+2, j-1:j+2])                                      # v is formed with the y-coordinates of the stencil
-            dx = np.hstack([u[0,0] - u[1,1], u[1,0] - u[1,1], \
-                            u[2,0] - u[1,1], u[0,1] - u[1,1], \
-                            u[2,1] - u[1,1], u[0,2] - u[1,1], \
-                            u[1,2] - u[1,1], u[2,2] - u[1,1]])                      # dx computation.
-            dy = np.hstack([v[0,0] - v[1,1], v[1,0] - v[1,1], \
-                            v[2,0] - v[1,1], v[0,1] - v[1,1], \
-                            v[2,1] - v[1,1], v[0,2] - v[1,1], \
-                            v[1,2] - v[1,1], v[2,2] - v[1,1]])                      # dy computation
-            M  = np.vstack([[dx], [dy], [dx**2], [dx*dy], [dy**2]])                 # M matrix is assembled.
-            M  = np.linalg.pinv(M)                                                  # The pseudoinverse of matrix M.
-            YY = M@L                                                                # M*L computation.
-            Gamma = np.vstack([-sum(YY), YY])                                       # Gamma values are found.
-            p           = m*(j) + i                                                 # Variable to find the correct position in the Matrix.
-            K[p, p]     = Gamma[0]                                                  # Gamma 0 assignation
-            K[p, p-1-m] = Gamma[1]                                                  # Gamma 1 assignation
-            K[p, p-m]   = Gamma[2]                                                  # Gamma 2 assignation
-            K[p, p+1-m] = Gamma[3]                                                  # Gamma 3 assignation
-            K[p, p-1]   = Gamma[4]                                                  # Gamma 4 assignation
-            K[p, p+1]   = Gamma[5]                                                  # Gamma 5 assignation
-            K[p, p-1+m] = Gamma[6]                                                  # Gamma 6 assignation
-            K[p, p+m]   = Gamma[7]                                                  # Gamma 7 assignation
-            K[p, p+1+m] = Gamma[8]                                                  # Gamma 8 assignation
-    
-    for j in np.arange(n):                                                          # For all the nodes in y.
-        K[m*j, m*j] = 0                                                             # Zeros for the boundary nodes.
-    
-    for i in np.arange(1,m-1):                                                      # For all the nodes in x.
-        p = i+(n-1)*m                                                               # Indexes for the boundary nodes.
-        K[i, i] = 0                                                                 # Zeros for the boundary nodes.
-        K[p, p] = 0                                                                 # Zeros for the boundary nodes.
-    
-    return K
\ No newline at end of file
+    # Matrix assembly
+    i, j = np.meshgrid(np.arange(1,m-1), np.arange(1,n-1), indexing = 'ij')         # Indexes of the inner nodes.
+    p    = (m*j + i).reshape(-1, 1)                                                 # Position of the inner nodes in the Matrix.
+    rows = np.repeat(p, 9, axis = 1)                                                # The row of the central node.
+    cols = p + offs                                                                 # The central node and its neighbors.
+    K    = Assemble(rows.ravel(), cols.ravel(), Gamma.ravel(), m*n, sparse)         # Boundary nodes keep rows of zeros.
+    return K
+
+def Mesh_Gammas(x, y, L):
+    """
+    Mesh_Gammas
+    Function to compute the Gamma values of all the inner nodes of a logically rectangular mesh.
+    The 3 x 3 stencils are taken from sliding-window views of x and y.
+     
+    Input:
+        x           m x n           Array           Array with the coordinates in x of the nodes.
+        y           m x n           Array           Array with the coordinates in y of the nodes.
+        L           5 x 1           Array           Array with the values of the differential operator.
+     
+    Output:
+        Gamma       m-2 x n-2 x 9   Array           Gammas of the central node and its neighbors (i-1,j-1), (i,j-1), (i+1,j-1), (i-1,j), (i+1,j), (i-1,j+1), (i,j+1), (i+1,j+1).
+    """
+    m  = len(x[:,0])                                                                # The number of nodes in x.
+    n  = len(x[0,:])                                                                # The number of nodes in y.
+    u  = np.lib.stride_tricks.sliding_window_view(x, (3, 3))                        # u is formed with the x-coordinates of the stencils.
+    v  = np.lib.stride_tricks.sliding_window_view(y, (3, 3))                        # v is formed with the y-coordinates of the stencils.
+    si = [0, 1, 2, 0, 2, 0, 1, 2]                                                   # Stencil position of each neighbor on x.
+    sj = [0, 0, 0, 1, 1, 2, 2, 2]                                                   # Stencil position of each neighbor on y.
+    dx = u[:, :, si, sj] - u[:, :, 1:2, 1]                                          # dx computation.
+    dy = v[:, :, si, sj] - v[:, :, 1:2, 1]                                          # dy computation.
+    Gamma = Weights(dx.reshape(-1, 8), dy.reshape(-1, 8), L)                        # Gamma values are found.
+    return Gamma.reshape(m-2, n-2, 9)
+
+def Weights(dx, dy, L, mask = None):
+    """
+    Weights
+    Function to compute the Gamma values of several stencils at once.
+    Stencils with fewer neighbors are padded; the padded neighbors have zero columns in M and therefore zero Gammas.
+     
+    Input:
+        dx          N x nvec        Array           Array with the distances in x from each node to its neighbors.
+        dy          N x nvec        Array           Array with the distances in y from each node to its neighbors.
+        L           5 x 1           Array           Array with the values of the differential operator.
+        mask        N x nvec        Array           Array with the valid neighbors of each node (Default: all of them).
+     
+    Output:
+        Gamma       N x nvec+1      Array           Gammas of the central node and each of its neighbors.
+    """
+    if mask is not None:                                                            # If some of the neighbors are padded.
+        dx = np.where(mask, dx, 0)                                                  # Padded dx are equal to 0.
+        dy = np.where(mask, dy, 0)                                                  # Padded dy are equal to 0.
+    M     = np.stack([dx, dy, dx**2, dx*dy, dy**2], axis = 1)                       # M matrices are assembled.
+    M     = np.linalg.pinv(M)                                                       # The pseudoinverses of all the matrices M.
+    YY    = (M@L)[:, :, 0]                                                          # M*L computation.
+    if mask is not None:                                                            # If some of the neighbors are padded.
+        YY = np.where(mask, YY, 0)                                                  # Padded Gammas are equal to 0.
+    Gamma = np.hstack([-np.sum(YY, axis = 1, keepdims = True), YY])                 # Gamma values are found.
+    return Gamma
+
+def Assemble(rows, cols, vals, m, sparse = False):
+    """
+    Assemble
+    Function to assemble the K matrix from the Gammas computed for each of the nodes.
+     
+    Input:
+        rows                        Array           Array with the row index of each Gamma.
+        cols                        Array           Array with the column index of each Gamma.
+        vals                        Array           Array with the Gamma values.
+        m                           Integer         The total number of nodes.
+        sparse                      Logical         Select whether or not K is assembled as a sparse matrix.
+                                                        True: K is a CSR sparse matrix.
+                                                        False: K is a dense array (Default).
+     
+    Output:
+        K           m x m           Array           K Matrix with the computed Gammas.
+    """
+    K = sp.csr_matrix((vals, (rows, cols)), shape = (m, m))                         # K is assembled in CSR format.
+    if sparse == False:                                                             # If a dense K was requested.
+        K = K.toarray()                                                             # K is converted to a dense array.
+    return K
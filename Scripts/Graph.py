@@ -13,16 +13,18 @@ Date:
     November, 2022.
 
 Last Modification:
-    March, 2023.
+    October, 2026.
 """
 
+import os
 import numpy as np
+import multiprocessing as mp
 import matplotlib.pyplot as plt
 from matplotlib import cm
-import moviepy.editor as mpy
-from moviepy.video.io.bindings import mplfig_to_npimage
+from matplotlib.tri import Triangulation
+from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
 
-def Mesh_Static_sav(x, y, u_ap, u_ex, nom):
+def Mesh_Static_sav(x, y, u_ap, u_ex, nom, T = None, preview = False):
     """
     Mesh_Static_Sav
 
@@ -36,54 +38,15 @@ def Mesh_Static_sav(x, y, u_ap, u_ex, nom):
         u_ap        m x n x t       Array           Array with the computed solution.
         u_ex        m x n x t       Array           Array with the theoretical solution.
         nom                         String          Name of the files to be saved to drive.
+        T           t x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+        preview                     Logical         Select whether or not the flat 2D preview is drawn instead of the 3D surfaces.
+                                                        True: Colormapped 2D plots, built once and updated (see Preview).
+                                                        False: 3D surfaces (Default).
     
     Output:
         None
     """
-    t    = len(u_ex[0,0,:])
-    step = int(np.ceil(t/2))
-    min  = u_ex.min()
-    max  = u_ex.max()
-    T    = np.linspace(0,1,t)
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[0])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_surface(x, y, u_ap[:,:,0], cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_surface(x, y, u_ex[:,:,0], cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '00.png'
-    plt.savefig(nok)
-    plt.close()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[step])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_surface(x, y, u_ap[:,:,step], cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_surface(x, y, u_ex[:,:,step], cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '05.png'
-    plt.savefig(nok)
-    plt.close()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[t-1])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_surface(x, y, u_ap[:,:,t-1], cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_surface(x, y, u_ex[:,:,t-1], cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '10.png'
-    plt.savefig(nok)
-    plt.close()
+    Static({'x': x, 'y': y}, u_ap, u_ex, nom, T, preview)
 
 
 def Mesh_Transient(x, y, u_ap, u_ex):
@@ -139,7 +102,7 @@ def Mesh_Transient(x, y, u_ap, u_ex):
     plt.pause(0.1)
 
 
-def Mesh_Transient_sav(x, y, u_ap, u_ex, nom):
+def Mesh_Transient_sav(x, y, u_ap, u_ex, nom, T = None, workers = None, preview = False):
     """
     Mesh_Transient_Sav
 
@@ -153,53 +116,20 @@ def Mesh_Transient_sav(x, y, u_ap, u_ex, nom):
         u_ap        m x n x t       Array           Array with the computed solution.
         u_ex        m x n x t       Array           Array with the theoretical solution.
         nom                         String          Name of the file to be saved to drive.
+        T           s x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+                                                        If T is given, u_ap and u_ex are snapshots and each of them is a frame.
+        workers                     Integer         Number of processes used to draw the frames (Default: the number of CPUs).
+        preview                     Logical         Select whether or not the flat 2D preview is drawn instead of the 3D surfaces.
+                                                        True: Colormapped 2D plots, built once and updated (see Preview).
+                                                        False: 3D surfaces (Default).
     
     Output:
         None
     """
-    t      = len(u_ex[0,0,:])
-    step   = int(np.ceil(t/50))
-    min    = u_ex.min()
-    max    = u_ex.max()
-    T      = np.linspace(0,1,t)
-    frames = []
-    
-    for k in np.arange(0,t,step):
-        fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-        tin = float(T[k])
-        plt.suptitle('Solution at t = %1.3f s.' %tin)
-        
-        ax1.plot_surface(x, y, u_ap[:,:,k], cmap=cm.coolwarm)
-        ax1.set_zlim([min, max])
-        ax1.set_title('Approximation')
+    Video({'x': x, 'y': y}, u_ap, u_ex, nom, T, workers, preview = preview)
 
-        ax2.plot_surface(x, y, u_ex[:,:,k], cmap=cm.coolwarm)
-        ax2.set_zlim([min, max])
-        ax2.set_title('Theoretical Solution')
 
-        frames.append(mplfig_to_npimage(fig))
-        plt.close()
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[t-1])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    
-    ax1.plot_surface(x, y, u_ap[:,:,t-1], cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-
-    ax2.plot_surface(x, y, u_ex[:,:,t-1], cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-
-    frames.append(mplfig_to_npimage(fig))
-    plt.close()
-
-    animation = mpy.VideoClip(lambda t: frames[int(t * 10)], duration=len(frames)/10)
-    animation.write_videofile(nom, fps=10, verbose=False, logger=None)
-
-
-def Cloud_Static_sav(p, tt, u_ap, u_ex, nom):
+def Cloud_Static_sav(p, tt, u_ap, u_ex, nom, T = None, preview = False):
     """
     Cloud_Static_Sav
 
@@ -213,56 +143,17 @@ def Cloud_Static_sav(p, tt, u_ap, u_ex, nom):
         u_ap        m x t           Array           Array with the computed solution.
         u_ex        m x t           Array           Array with the theoretical solution.
         nom                         String          Name of the files to be saved to drive.
+        T           t x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+        preview                     Logical         Select whether or not the flat 2D preview is drawn instead of the 3D surfaces.
+                                                        True: Colormapped 2D plots, built once and updated (see Preview).
+                                                        False: 3D surfaces (Default).
     
     Output:
         None
     """
     if tt.min() == 1:
-        tt -= 1
-    t    = len(u_ex[0,:])
-    step = int(np.ceil(t/2))
-    min  = u_ex.min()
-    max  = u_ex.max()
-    T    = np.linspace(0,1,t)
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[0])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_trisurf(p[:,0], p[:,1], u_ap[:,0], triangles=tt, cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_trisurf(p[:,0], p[:,1], u_ex[:,0], triangles=tt, cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '00.png'
-    plt.savefig(nok)
-    plt.close()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[step])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_trisurf(p[:,0], p[:,1], u_ap[:,step], triangles=tt, cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_trisurf(p[:,0], p[:,1], u_ex[:,step], triangles=tt, cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '05.png'
-    plt.savefig(nok)
-    plt.close()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[t-1])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-    ax1.plot_trisurf(p[:,0], p[:,1], u_ap[:,t-1], triangles=tt, cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    ax2.plot_trisurf(p[:,0], p[:,1], u_ex[:,t-1], triangles=tt, cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    nok = nom + '10.png'
-    plt.savefig(nok)
-    plt.close()
+        tt = tt - 1
+    Static({'p': p, 'tt': tt}, u_ap, u_ex, nom, T, preview)
 
 
 def Cloud_Transient(p, tt, u_ap, u_ex):
@@ -320,7 +211,7 @@ def Cloud_Transient(p, tt, u_ap, u_ex):
     plt.pause(0.1)
 
 
-def Cloud_Transient_sav(p, tt, u_ap, u_ex, nom):
+def Cloud_Transient_sav(p, tt, u_ap, u_ex, nom, T = None, workers = None, preview = False):
     """
     Cloud_Transient_sav
 
@@ -334,52 +225,19 @@ def Cloud_Transient_sav(p, tt, u_ap, u_ex, nom):
         u_ap        m x t           Array           Array with the computed solution.
         u_ex        m x t           Array           Array with the theoretical solution.
         nom                         String          Name of the files to be saved to drive.
+        T           s x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+                                                        If T is given, u_ap and u_ex are snapshots and each of them is a frame.
+        workers                     Integer         Number of processes used to draw the frames (Default: the number of CPUs).
+        preview                     Logical         Select whether or not the flat 2D preview is drawn instead of the 3D surfaces.
+                                                        True: Colormapped 2D plots, built once and updated (see Preview).
+                                                        False: 3D surfaces (Default).
     
     Output:
         None
     """
     if tt.min() == 1:
-        tt -= 1
-    t      = len(u_ex[0,:])
-    step   = int(np.ceil(t/50))
-    min    = u_ex.min()
-    max    = u_ex.max()
-    T      = np.linspace(0,1,t)
-    frames = []
-
-    for k in np.arange(0,t,step):
-        fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize = (8, 4))
-        tin = float(T[k])
-        plt.suptitle('Solution at t = %1.3f s.' %tin)
-
-        ax1.plot_trisurf(p[:,0], p[:,1], u_ap[:,k], triangles=tt, cmap=cm.coolwarm)
-        ax1.set_zlim([min, max])
-        ax1.set_title('Approximation')
-        
-        ax2.plot_trisurf(p[:,0], p[:,1], u_ex[:,k], triangles=tt, cmap=cm.coolwarm)
-        ax2.set_zlim([min, max])
-        ax2.set_title('Theoretical Solution')
-
-        frames.append(mplfig_to_npimage(fig))
-        plt.close()
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
-    tin = float(T[t-1])
-    plt.suptitle('Solution at t = %1.3f s.' %tin)
-
-    ax1.plot_trisurf(p[:,0], p[:,1], u_ap[:,t-1], triangles=tt, cmap=cm.coolwarm)
-    ax1.set_zlim([min, max])
-    ax1.set_title('Approximation')
-    
-    ax2.plot_trisurf(p[:,0], p[:,1], u_ex[:,t-1], triangles=tt, cmap=cm.coolwarm)
-    ax2.set_zlim([min, max])
-    ax2.set_title('Theoretical Solution')
-    
-    frames.append(mplfig_to_npimage(fig))
-    plt.close()
-
-    animation = mpy.VideoClip(lambda t: frames[int(t * 10)], duration=len(frames)/10)
-    animation.write_videofile(nom, fps=10, verbose=False, logger=None)
+        tt = tt - 1
+    Video({'p': p, 'tt': tt}, u_ap, u_ex, nom, T, workers, preview = preview)
 
 
 def Error(er):
@@ -439,4 +297,248 @@ def Error_sav(er,nom):
     plt.suptitle('Quadratic Mean Error')
 
     plt.savefig(nom)
-    plt.close()
\ No newline at end of file
+    plt.close()
+
+
+def Frames(t):
+    """
+    Frames
+
+    This function finds the time levels used as frames of the videos: about 50 equally spaced time levels, and the last one.
+
+    Input:
+        t                           Integer         Number of time levels.
+
+    Output:
+        ks                          Array           Array with the time levels of the frames.
+    """
+    step = int(np.ceil(t/50))
+    ks   = np.append(np.arange(0,t,step), t-1)
+    return ks
+
+
+def Figure(geo, u_ap, u_ex, tin, zlim):
+    """
+    Figure
+
+    This function draws the approximated and theoretical solutions at one time level, side by side.
+
+    Input:
+        geo                         Dictionary      Dictionary with p and tt for clouds, or x and y for meshes.
+        u_ap        m x 1           Array           Array with the computed solution (or m x n for meshes).
+        u_ex        m x 1           Array           Array with the theoretical solution (or m x n for meshes).
+        tin                         Real            Time of the solutions.
+        zlim                        List            Limits for the z axis.
+
+    Output:
+        fig                         Figure          Figure with both solutions.
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, subplot_kw = {"projection": "3d"}, figsize=(8, 4))
+    plt.suptitle('Solution at t = %1.3f s.' %tin)
+    for ax, u, title in [(ax1, u_ap, 'Approximation'), (ax2, u_ex, 'Theoretical Solution')]:
+        if 'tt' in geo:
+            ax.plot_trisurf(geo['p'][:,0], geo['p'][:,1], u, triangles=geo['tt'], cmap=cm.coolwarm)
+        else:
+            ax.plot_surface(geo['x'], geo['y'], u, cmap=cm.coolwarm)
+        ax.set_zlim(zlim)
+        ax.set_title(title)
+    return fig
+
+
+def Static(geo, u_ap, u_ex, nom, T = None, preview = False):
+    """
+    Static
+
+    This function saves the figures of the solutions at the first, the middle and the last time levels.
+
+    Input:
+        geo                         Dictionary      Dictionary with p and tt for clouds, or x and y for meshes.
+        u_ap        ... x t         Array           Array with the computed solution.
+        u_ex        ... x t         Array           Array with the theoretical solution.
+        nom                         String          Name of the files to be saved to drive.
+        T           t x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+        preview                     Logical         Select whether or not the flat 2D preview is drawn (Default: False).
+
+    Output:
+        None
+    """
+    t    = u_ex.shape[-1]
+    zlim = [u_ex.min(), u_ex.max()]
+    if T is None:
+        T  = np.linspace(0,1,t)
+        ks = [0, int(np.ceil(t/2)), t-1]
+    else:
+        T  = np.asarray(T)
+        ks = [0, int(np.argmin(np.abs(T - (T[0] + T[-1])/2))), t-1]
+    _Start(geo, preview)
+    for k, suf in zip(ks, ['00', '05', '10']):
+        if preview == True:
+            plt.imsave(nom + suf + '.png', Preview(u_ap[...,k], u_ex[...,k], float(T[k]), zlim))
+        else:
+            fig = Figure(geo, u_ap[...,k], u_ex[...,k], float(T[k]), zlim)
+            plt.savefig(nom + suf + '.png')
+            plt.close(fig)
+    _Stop()
+
+
+_geo     = {}                                                                       # Geometry used by the processes that draw the frames.
+_preview = False                                                                    # Select whether or not those processes draw the 2D preview.
+_frame   = None                                                                     # Preview figure of the process, with its artists.
+
+
+def _Start(geo, preview = False):
+    """
+    _Start
+
+    This function stores the geometry on each of the processes that draw the frames, so it is only sent once.
+
+    Input:
+        geo                         Dictionary      Dictionary with p and tt for clouds, or x and y for meshes.
+        preview                     Logical         Select whether or not the frames are drawn with the 2D preview (Default: False).
+    """
+    global _geo, _preview
+    _Stop()
+    _geo     = geo
+    _preview = preview
+
+
+def _Stop():
+    """
+    _Stop
+
+    This function closes the preview figure of the process, if there is one.
+    """
+    global _frame
+    if _frame is not None:
+        plt.close(_frame[0])
+        _frame = None
+
+
+def Preview(u_ap, u_ex, tin, zlim):
+    """
+    Preview
+
+    This function draws the approximated and theoretical solutions at one time level as flat colormapped plots, and rasterizes them.
+    The figure is built and drawn once on each process, with tripcolor for clouds and pcolormesh for meshes.
+    On the following calls only the colors and the title are updated and drawn over the stored background.
+
+    Input:
+        u_ap        m x 1           Array           Array with the computed solution (or m x n for meshes).
+        u_ex        m x 1           Array           Array with the theoretical solution (or m x n for meshes).
+        tin                         Real            Time of the solutions.
+        zlim                        List            Limits for the colormap.
+
+    Output:
+        img         h x w x 3       Array           Image of the solutions.
+    """
+    global _frame
+    if _frame is None or _frame[4] != zlim:                                         # The figure is only built once for each colormap.
+        _Stop()
+        fig, axs = plt.subplots(1, 2, figsize=(8, 4))
+        arts     = []
+        for ax, title in zip(axs, ['Approximation', 'Theoretical Solution']):
+            if 'tt' in _geo:
+                tri = Triangulation(_geo['p'][:,0], _geo['p'][:,1], _geo['tt'])
+                art = ax.tripcolor(tri, np.zeros(len(_geo['tt'])), cmap=cm.coolwarm, vmin=zlim[0], vmax=zlim[1])
+            else:
+                art = ax.pcolormesh(_geo['x'], _geo['y'], np.zeros_like(_geo['x']), shading='gouraud', cmap=cm.coolwarm, vmin=zlim[0], vmax=zlim[1])  # Values on the nodes of the curvilinear mesh.
+            art.set_animated(True)                                                  # Only drawn on top of the background.
+            ax.set_aspect('equal')
+            ax.set_title(title)
+            arts.append(art)
+        fig.colorbar(arts[1], ax=axs)
+        sup = fig.suptitle('', animated=True)
+        fig.canvas.draw()
+        _frame = (fig, arts, sup, fig.canvas.copy_from_bbox(fig.bbox), list(zlim))
+    fig, arts, sup, bg, _ = _frame
+    fig.canvas.restore_region(bg)
+    sup.set_text('Solution at t = %1.3f s.' %tin)
+    for art, u in zip(arts, [u_ap, u_ex]):
+        if 'tt' in _geo:
+            art.set_array(np.asarray(u)[_geo['tt']].mean(axis=1))                   # Flat color of each triangle.
+        else:
+            art.set_array(np.asarray(u))                                            # Interpolated between the nodes.
+        fig.draw_artist(art)
+    fig.draw_artist(sup)
+    img = np.array(fig.canvas.buffer_rgba())[:,:,:3]                                # The RGB channels of the figure.
+    return img
+
+
+def Image(args):
+    """
+    Image
+
+    This function draws one frame of a video and rasterizes it.
+
+    Input:
+        args                        Tuple           (u_ap, u_ex, tin, zlim) of the frame.
+
+    Output:
+        img         h x w x 3       Array           Image of the frame.
+    """
+    u_ap, u_ex, tin, zlim = args
+    if _preview == True:
+        return Preview(u_ap, u_ex, tin, zlim)
+    fig = Figure(_geo, u_ap, u_ex, tin, zlim)
+    fig.canvas.draw()
+    img = np.array(fig.canvas.buffer_rgba())[:,:,:3]                                # The RGB channels of the drawn figure.
+    plt.close(fig)
+    return img
+
+
+def Video(geo, u_ap, u_ex, nom, T = None, workers = None, fps = 10, preview = False):
+    """
+    Video
+
+    This function saves a video of the solutions.
+    The frames are drawn on a pool of processes and sent to the encoder, in order, as soon as they are ready.
+    At most 2*workers frames are in memory at any time.
+
+    Input:
+        geo                         Dictionary      Dictionary with p and tt for clouds, or x and y for meshes.
+        u_ap        ... x t         Array           Array with the computed solution.
+        u_ex        ... x t         Array           Array with the theoretical solution.
+        nom                         String          Name of the file to be saved to drive.
+        T           s x 1           Array           Array with the times of the solutions (Default: None, all the time levels on [0, 1]).
+                                                        If T is given, each of the time levels is a frame.
+        workers                     Integer         Number of processes used to draw the frames (Default: the number of CPUs).
+        fps                         Integer         Frames per second (Default: 10).
+        preview                     Logical         Select whether or not the frames are drawn with the 2D preview (Default: False).
+                                                        Each process builds the preview figure once and only updates its colors.
+
+    Output:
+        None
+    """
+    t    = u_ex.shape[-1]
+    zlim = [u_ex.min(), u_ex.max()]
+    if T is None:
+        T  = np.linspace(0,1,t)
+        ks = Frames(t)
+    else:
+        ks = np.arange(t)
+    args    = ((np.asarray(u_ap[...,k]), np.asarray(u_ex[...,k]), float(T[k]), zlim) for k in ks)
+    workers = workers or os.cpu_count() or 1
+    writer  = None
+
+    def write(img):
+        nonlocal writer
+        if writer is None:
+            writer = FFMPEG_VideoWriter(nom, (img.shape[1], img.shape[0]), fps)
+        writer.write_frame(img)
+
+    if workers == 1:
+        _Start(geo, preview)
+        for a in args:
+            write(Image(a))
+        _Stop()
+    else:
+        with mp.Pool(workers, initializer = _Start, initargs = (geo, preview)) as pool:
+            pending = []
+            for a in args:
+                pending.append(pool.apply_async(Image, (a,)))
+                if len(pending) >= 2*workers:
+                    write(pending.pop(0).get())
+            for r in pending:
+                write(r.get())
+    if writer is not None:
+        writer.close()
@@ -13,12 +13,14 @@ Date:
     November, 2022.
 
 Last Modification:
-    March, 2023.
+    October, 2026.
 """
 
 import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
 
-def Triangulation(p, tt, nvec):
+def Triangulation(p, tt, nvec, adjacency = False):
     """
     Triangulation
     Function to find the neighbor nodes in a triangulation.
@@ -27,9 +29,13 @@ def Triangulation(p, tt, nvec):
         p           m x 2           double          Array with the coordinates of the nodes.
         tt          n x 3           double          Array with the correspondence of the n triangles.
         nvec                        integer         Maximum number of neighbors.
+        adjacency                   Logical         Select whether or not the adjacency matrix is also returned.
+                                                        True: vec and A are returned.
+                                                        False: Only vec is returned (Default).
     
     Output:
         vec         m x nvec        double          Array with matching neighbors of each node.
+        A           m x m           Sparse          CSR adjacency matrix of the triangulation (only if adjacency is True).
     """
 
     # Variable initialization
@@ -37,17 +43,39 @@ def Triangulation(p, tt, nvec):
     vec = np.zeros([m, nvec], dtype=int)-1                                          # The array for the neighbors is initialized.
 
     # Neighbor search
-    for i in np.arange(m):                                                          # For each of the nodes.
-        kn    = np.argwhere(tt == i)                                                # Search in which triangles the node appears.
-        vec2  = np.setdiff1d(tt[kn[:,0]], i)                                        # Neighbors are stored inside vec2.
-        vec2  = np.vstack([vec2])                                                   # Convert vec2 to a column.
-        nvec2 = sum(vec2[0,:] != -1)                                                # The number of neighbors of the node is calculated.
-        nnvec = np.minimum(nvec, nvec2)                                             # The real number of neighbors.
-        for j in np.arange(nnvec):                                                  # For each of the nodes.
-            vec[i,j] = vec2[0,j]                                                    # Neighbors are saved.
+    A    = Adjacency(m, tt)                                                         # The neighbors of each node, sorted by index.
+    deg  = np.diff(A.indptr)                                                        # The number of neighbors of each node.
+    rows = np.repeat(np.arange(m), deg)                                             # The central node of each neighbor.
+    pos  = np.arange(len(A.indices)) - np.repeat(A.indptr[:-1], deg)                # Position of each neighbor in vec.
+    keep = pos < nvec                                                               # Only the first nvec neighbors are kept.
+    vec[rows[keep], pos[keep]] = A.indices[keep]                                    # Neighbors are saved.
+
+    if adjacency == True:                                                           # If the adjacency matrix is requested.
+        return vec, A
     return vec
 
-def Cloud(p, nvec):
+def Adjacency(m, tt):
+    """
+    Adjacency
+    Function to build the node-to-node adjacency of a triangulation in one pass over the triangles.
+    
+    Input:
+        m                           integer         The total number of nodes.
+        tt          n x 3           double          Array with the correspondence of the n triangles.
+    
+    Output:
+        A           m x m           Sparse          CSR adjacency matrix, with the neighbors of each node sorted by index.
+    """
+    tt = np.asarray(tt, dtype = int)                                                # Triangles as integers.
+    ii = tt[:, [0, 1, 2, 1, 2, 0]].ravel()                                          # First node of each edge, in both directions.
+    jj = tt[:, [1, 2, 0, 0, 1, 2]].ravel()                                          # Second node of each edge, in both directions.
+    kk = ii != jj                                                                   # Nodes are not neighbors of themselves.
+    A  = sp.csr_matrix((np.ones(np.sum(kk)), (ii[kk], jj[kk])), shape = (m, m))     # Edge list to CSR, repeated edges are summed.
+    A.sort_indices()                                                                # Neighbors are sorted by index.
+    A.data[:] = 1                                                                   # Repeated edges are counted once.
+    return A
+
+def Cloud(p, nvec, tree = True):
     """
     Clouds
     Routine to find the neighbor nodes in a cloud of points generated with dmsh on Python.
@@ -55,10 +83,15 @@ def Cloud(p, nvec):
     Input:
         p           m x 3           Array           Array with the coordinates of the nodes and a flag for the boundary.
         nvec                        integer         Maximum number of neighbors.
+        tree                        Logical         Select whether or not a k-d tree is used for the search.
+                                                        True: k-d tree search, O(m log m) (Default).
+                                                        False: Search over all the pairs of nodes, O(m^2).
     
     Output:
         vec         m x nvec        double          Array with matching neighbors of each node.
     """
+    if tree == True:                                                                # If the k-d tree search is requested.
+        return Cloud_Tree(p, nvec)                                                  # Neighbor search with the proper routine.
 
     # Variable initialization
     m    = len(p[:,0])                                                              # The size if the triangulation is obtained.
@@ -98,4 +131,163 @@ def Cloud(p, nvec):
                         I  = np.argmax(d2)                                          # Look for the greatest distance.
                         if d < d2[I]:                                               # If the new node is closer than the farthest neighbor.
                             vec[i,I] = j                                            # The new neighbor replace the farthest one.
-    return vec
\ No newline at end of file
+    return vec
+
+def Cloud_Tree(p, nvec, visible = None):
+    """
+    Cloud_Tree
+    Routine to find the neighbor nodes in a cloud of points using a k-d tree.
+    The neighbors, and their order in vec, are the same found by the search over all the pairs of nodes.
+    
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and a flag for the boundary.
+        nvec                        integer         Maximum number of neighbors.
+        visible                     Function        Function called as visible(i, j, dist) with the mask of the possible neighbors j that node i can see (Default: None, all of them).
+    
+    Output:
+        vec         m x nvec        double          Array with matching neighbors of each node.
+    """
+
+    # Variable initialization
+    m    = len(p[:,0])                                                              # The size if the triangulation is obtained.
+    vec  = np.zeros([m, nvec], dtype=int) - 1                                       # The array for the neighbors is initialized.
+    x    = p[:,0]                                                                   # x coordinates of the nodes.
+    y    = p[:,1]                                                                   # y coordinates of the nodes.
+    kdt  = cKDTree(p[:,0:2])                                                        # k-d tree with all the nodes.
+
+    # Delta computation for finding neighbors
+    _, I = kdt.query(p[:,0:2], k = 2)                                               # The closest node to each node.
+    I    = np.where(I[:,0] == np.arange(m), I[:,1], I[:,0])                         # The central node is discarded.
+    dmin = np.sqrt((x - x[I])**2 + (y - y[I])**2)                                   # Minimum distance from each node.
+    dist = (3/2)*max(np.minimum(dmin, 1))                                           # dmin has a "big" value of 1.
+
+    # Search of the neighbor nodes
+    cand = kdt.query_ball_point(p[:,0:2], r = dist*(1 + 1e-12), return_sorted = True)
+    for i in np.arange(m):                                                          # For each of the nodes.
+        j    = np.array(cand[i], dtype = int)                                       # Possible neighbors sorted by index.
+        d    = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)                         # Distance from the possible neighbors to the central node.
+        keep = (j != i) & (d < dist)                                                # Only the nodes closer than the tolerance distance.
+        if visible is not None:                                                     # If some of the nodes can not be seen.
+            keep[keep] = visible(i, j[keep], dist)                                  # Only the visible nodes.
+        j    = j[keep].tolist()                                                     # Neighbors as a list.
+        d    = d[keep].tolist()                                                     # Distances as a list.
+        vi   = j[:nvec]                                                             # The first nvec neighbors are saved.
+        di   = d[:nvec]                                                             # Distances of the saved neighbors.
+        for k in np.arange(nvec, len(j)):                                           # If the number of neighbors is greater than nvec.
+            I = int(np.argmax(di))                                                  # Look for the greatest distance.
+            if d[k] < di[I]:                                                        # If the new node is closer than the farthest neighbor.
+                vi[I] = j[k]                                                        # The new neighbor replace the farthest one.
+                di[I] = d[k]                                                        # The distance is updated.
+        vec[i, :len(vi)] = vi                                                       # Neighbors are saved.
+    return vec
+
+def Cloud_Holes(p, tt, nvec):
+    """
+    Cloud_Holes
+    Routine to find the neighbor nodes in a cloud of points with holes, using a k-d tree.
+    The neighbors are the same found by Cloud_Tree, except the ones that can not be seen from the central node:
+        - If the segment between both nodes crosses the boundary (the outer one or the one of a hole).
+        - If both nodes are on the boundary and the middle of the segment is outside of the region (across a hole or a concave part).
+    The edges of the triangulation are always visible, even where the boundary of a coarse triangulation overlaps itself.
+    The boundary segments close to each node are found with a k-d tree of their middle points, so the search is still O(m log m).
+    
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and a flag for the boundary.
+        tt          n x 3           Array           Array with the correspondence of the n triangles, that do not cover the holes.
+        nvec                        integer         Maximum number of neighbors.
+    
+    Output:
+        vec         m x nvec        double          Array with matching neighbors of each node.
+    """
+
+    # Variable initialization
+    q    = np.asarray(p[:,0:2], dtype = float)                                      # Coordinates of the nodes.
+    tt   = np.asarray(tt, dtype = int)                                              # Triangles as integers.
+    bnd  = np.asarray(p[:,2]) == 1                                                  # Boundary nodes.
+    seg  = Segments(tt)                                                             # Boundary segments.
+    A, B = q[seg[:,0]], q[seg[:,1]]                                                 # Ends of the boundary segments.
+    smax = np.sqrt(np.max(np.sum((B - A)**2, axis = 1)))                            # Length of the longest segment.
+    stre = cKDTree((A + B)/2)                                                       # k-d tree with the middle of the segments.
+    E    = Adjacency(len(q), tt)                                                    # Edges of the triangulation.
+    cen  = q[tt].mean(axis = 1)                                                     # Centroid of each triangle.
+    rmax = np.max(np.sqrt(np.sum((q[tt] - cen[:, np.newaxis, :])**2, axis = 2)))    # Largest distance from a centroid to its vertices.
+    ttre = cKDTree(cen)                                                             # k-d tree with the centroids of the triangles.
+
+    def visible(i, j, dist):
+        tri = np.isin(j, E.indices[E.indptr[i]:E.indptr[i+1]])                      # Neighbors on the triangulation.
+        ok  = np.ones(len(j), dtype = bool)                                         # All the nodes are visible at first.
+        S   = np.array(stre.query_ball_point(q[i], r = dist + smax/2), dtype = int) # Segments that can cross the ones from node i.
+        if len(S) > 0:                                                              # Proper crossings between both segments.
+            Pi, Pj = q[i], q[j][:, np.newaxis, :]
+            a, b   = A[S][np.newaxis], B[S][np.newaxis]
+            o1     = Cross(b - a, Pi - a)
+            o2     = Cross(b - a, Pj - a)
+            o3     = Cross(Pj - Pi, a - Pi)
+            o4     = Cross(Pj - Pi, b - Pi)
+            ok    &= ~np.any((o1*o2 < 0) & (o3*o4 < 0), axis = 1)
+        if bnd[i] == True:                                                          # Chords between two boundary nodes.
+            for k in np.where(ok & bnd[j] & ~tri)[0]:
+                ok[k] = Inside((q[i] + q[j[k]])/2, q, tt, ttre, rmax)
+        return ok | tri
+
+    vec = Cloud_Tree(p, nvec, visible)                                              # Neighbor search with the visible nodes.
+    return vec
+
+def Segments(tt):
+    """
+    Segments
+    Function to find the boundary segments of a triangulation, the edges that belong to only one triangle.
+    They include the outer boundary and the boundary of each hole.
+
+    Input:
+        tt          n x 3           Array           Array with the correspondence of the n triangles.
+
+    Output:
+        seg         b x 2           Array           Array with the nodes of each boundary segment.
+    """
+    tt     = np.asarray(tt, dtype = int)                                            # Triangles as integers.
+    e      = np.sort(tt[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis = 1)            # The three edges of each triangle.
+    e, cnt = np.unique(e, axis = 0, return_counts = True)                           # Each edge once, and its number of triangles.
+    seg    = e[cnt == 1]                                                            # Edges of only one triangle.
+    return seg
+
+def Cross(u, w):
+    """
+    Cross
+    Function to compute the z component of the cross product of 2D vectors.
+
+    Input:
+        u           ... x 2         Array           First vectors.
+        w           ... x 2         Array           Second vectors.
+
+    Output:
+        c           ...             Array           Cross product of each pair of vectors.
+    """
+    return u[...,0]*w[...,1] - u[...,1]*w[...,0]
+
+def Inside(x, q, tt, ttre, rmax, tol = 1e-12):
+    """
+    Inside
+    Function to check whether or not a point is inside of the triangulated region.
+
+    Input:
+        x           2 x 1           Array           Coordinates of the point.
+        q           m x 2           Array           Coordinates of the nodes.
+        tt          n x 3           Array           Array with the correspondence of the n triangles.
+        ttre                        cKDTree         k-d tree with the centroids of the triangles.
+        rmax                        Real            Largest distance from a centroid to its vertices.
+        tol                         Real            Tolerance for points on the edges of the triangles (Default: 1e-12).
+
+    Output:
+        ins                         Logical         True if the point is inside of a triangle.
+    """
+    T = np.array(ttre.query_ball_point(x, r = rmax*(1 + 1e-9)), dtype = int)        # Triangles that can contain the point.
+    if len(T) == 0:
+        return False
+    a, b, c = q[tt[T,0]], q[tt[T,1]], q[tt[T,2]]                                    # Vertices of those triangles.
+    d  = Cross(b - a, c - a)                                                        # Twice the signed area of each triangle.
+    l1 = Cross(b - x, c - x)/d                                                      # Barycentric coordinates of the point.
+    l2 = Cross(c - x, a - x)/d
+    l3 = 1 - l1 - l2
+    ins = bool(np.any((l1 >= -tol) & (l2 >= -tol) & (l3 >= -tol)))
+    return ins
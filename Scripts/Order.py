@@ -0,0 +1,113 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+# Available orderings
+methods = ['hilbert', 'rcm']
+
+def Hilbert(p, bits = 16):
+    """
+    Hilbert
+    Function to sort the nodes along a Hilbert curve, so the nodes that are close in the plane are also close in memory.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        bits                        Integer         Number of bits of each coordinate on the curve (Default: 16).
+
+    Output:
+        perm        m x 1           Array           Array with the new order of the nodes.
+    """
+    n    = 2**bits                                                                  # Number of cells on each direction.
+    lo   = p[:,0:2].min(axis = 0)                                                   # Lower corner of the cloud.
+    ext  = np.maximum(p[:,0:2].max(axis = 0) - lo, np.finfo(float).tiny)            # Size of the cloud.
+    q    = np.minimum(((p[:,0:2] - lo)/ext*n).astype(np.int64), n - 1)              # Cell of each node.
+    x, y = q[:,0], q[:,1]
+    d    = np.zeros(len(x), dtype = np.int64)                                       # Position of each node on the curve.
+    s    = n//2
+    while s > 0:                                                                    # From the largest to the smallest quadrants.
+        rx = (x & s) > 0                                                            # Quadrant of each node.
+        ry = (y & s) > 0
+        d += s*s*((3*rx) ^ ry)                                                      # Quadrants before the one of the node.
+        rot = ry == False                                                           # The quadrant is rotated.
+        ref = rot & rx                                                              # The quadrant is also reflected.
+        x   = np.where(ref, n - 1 - x, x)
+        y   = np.where(ref, n - 1 - y, y)
+        x, y = np.where(rot, y, x), np.where(rot, x, y)
+        s //= 2
+    return np.argsort(d, kind = 'stable')
+
+def RCM(K):
+    """
+    RCM
+    Function to sort the nodes with the reverse Cuthill-McKee algorithm, to reduce the bandwidth of an operator.
+
+    Input:
+        K           m x m           Sparse          Matrix with the pattern of the operator.
+
+    Output:
+        perm        m x 1           Array           Array with the new order of the nodes.
+    """
+    A = abs(sp.csr_matrix(K))                                                       # Pattern of the operator.
+    A = (A + A.T).tocsr()                                                           # Symmetric graph.
+    return np.asarray(reverse_cuthill_mckee(A, symmetric_mode = True), dtype = int)
+
+def Permutation(p, K, method = 'hilbert'):
+    """
+    Permutation
+    Function to find a new order of the nodes of a cloud that keeps the neighbors close in memory.
+
+    Input:
+        p           m x 3           Array           Array with the coordinates of the nodes and the flag for boundary or inner node.
+        K           m x m           Sparse          K Matrix with the computed Gammas.
+        method                      String          Ordering of the nodes.
+                                                        'hilbert': Along a Hilbert curve of the coordinates (Default).
+                                                        'rcm': Reverse Cuthill-McKee on the pattern of K.
+
+    Output:
+        perm        m x 1           Array           Array with the new order, the new node i is the old node perm[i].
+        inv         m x 1           Array           Array with the inverse permutation, the old node i is the new node inv[i].
+    """
+    if method == 'hilbert':                                                         # Along a Hilbert curve.
+        perm = Hilbert(p)
+    elif method == 'rcm':                                                           # Reverse Cuthill-McKee.
+        perm = RCM(K)
+    else:
+        raise ValueError('Unknown ordering ' + str(method) + ', it must be one of ' + ', '.join(methods) + '.')
+    inv       = np.empty_like(perm)
+    inv[perm] = np.arange(len(perm))                                                # The inverse permutation.
+    return perm, inv
+
+def Matrix(K, perm):
+    """
+    Matrix
+    Function to reorder the rows and columns of an operator.
+    The result is the operator assembled on the reordered nodes, with the same Gammas.
+
+    Input:
+        K           m x m           Sparse          K Matrix with the computed Gammas.
+        perm        m x 1           Array           Array with the new order of the nodes (see Permutation).
+
+    Output:
+        K           m x m           Sparse          CSR matrix on the new order.
+    """
+    K = sp.csr_matrix(K)[perm][:, perm].tocsr()                                     # Rows and columns on the new order.
+    K.sort_indices()                                                                # Columns sorted on each row.
+    return K
@@ -0,0 +1,127 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import sys
+import time
+import contextlib
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+try:
+    import resource
+except ImportError:                                                                 # There is no resource module on Windows.
+    resource = None
+
+def Peak():
+    """
+    Peak
+    Function to find the high-water mark of the memory of the process (the maximum resident set size).
+
+    Output:
+        mem                         Integer         Peak memory of the process in bytes, None if it is not available.
+    """
+    if resource is None:                                                            # If the memory is not available.
+        return None
+    mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss                        # In kilobytes on Linux, in bytes on macOS.
+    return int(mem) if sys.platform == 'darwin' else int(mem)*1024
+
+@contextlib.contextmanager
+def Stage(stats, name):
+    """
+    Stage
+    Context manager to add the wall time of a stage to stats['time'][name].
+    The peak memory of the process up to the end of the stage is stored on stats['peak_memory'], so after the run it holds the peak of the whole run.
+    Nothing is measured if stats is None.
+
+    Input:
+        stats                       Dictionary      Dictionary with the information about the run, or None.
+        name                        String          Name of the stage.
+    """
+    if stats is None:                                                               # If the information is not requested.
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        tim = stats.setdefault('time', {})
+        tim[name] = tim.get(name, 0) + time.perf_counter() - t0                     # The time is added over several calls.
+        stats['peak_memory'] = Peak()                                               # High-water mark of the process, it never decreases.
+
+def Timed(gen, stats, name):
+    """
+    Timed
+    Generator that returns the values of gen and adds the time spent on them to stats['time'][name] (see Stage).
+    Only the clock is read on each value, the peak memory is stored once when gen is finished.
+
+    Input:
+        gen                         Generator       Generator to be timed.
+        stats                       Dictionary      Dictionary with the information about the run, or None.
+        name                        String          Name of the stage.
+
+    Output:
+        val                         Various         The values of gen.
+    """
+    if stats is None:                                                               # If the information is not requested.
+        yield from gen
+        return
+    tim       = stats.setdefault('time', {})
+    tim[name] = tim.get(name, 0)
+    try:
+        while True:
+            t0 = time.perf_counter()
+            try:
+                val = next(gen)
+            except StopIteration:
+                return
+            finally:
+                tim[name] += time.perf_counter() - t0                               # The time is added over all the values.
+            yield val
+    finally:
+        stats['peak_memory'] = Peak()                                               # Only at the end of the stage.
+
+def Operator(stats, K1, K2 = None):
+    """
+    Operator
+    Function to store the sparsity and conditioning metrics of the operators on stats['operator'].
+
+    Input:
+        stats                       Dictionary      Dictionary with the information about the run, or None.
+        K1          m x m           Sparse          K Matrix with the computed Gammas for dt = 1.
+        K2          m x m           Operator        Time-stepping operator (Default: None).
+                                                        Sparse: ||K2||_1 is stored, a bound of the growth on each explicit step.
+                                                        Implicit operator: the fill-in of the factorization and cond_1 of the left-hand matrix are stored.
+    """
+    if stats is None or K1 is None:                                                 # If the information is not requested.
+        return
+    K1   = sp.csr_matrix(K1)
+    m    = K1.shape[0]                                                              # The total number of nodes.
+    r, c = K1.nonzero()
+    info = {'nodes': m, 'nnz': int(K1.nnz), 'density': K1.nnz/m**2,
+            'row_max': int(np.diff(K1.indptr).max()),                               # Largest number of entries on a row.
+            'bandwidth': int(np.abs(r - c).max()) if len(r) > 0 else 0,
+            'norm1': float(spla.norm(K1, 1))}
+    if sp.issparse(K2):                                                             # For the explicit scheme.
+        info['K2_norm1'] = float(spla.norm(K2, 1))
+    elif hasattr(K2, 'LU'):                                                         # For the implicit scheme.
+        A, LU = K2.A, K2.LU
+        cast  = lambda u: np.asarray(u, dtype = A.dtype)                            # The factorization only takes its own type.
+        Ai    = spla.LinearOperator(A.shape, matvec = lambda u: LU.solve(cast(u)), rmatvec = lambda u: LU.solve(cast(u), 'T'), dtype = A.dtype)
+        info['fill']  = int(LU.L.nnz + LU.U.nnz)                                    # Entries of both factors.
+        info['cond1'] = float(spla.norm(A, 1)*spla.onenormest(Ai))                  # Estimated 1-norm condition number.
+    stats['operator'] = info
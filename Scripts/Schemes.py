@@ -0,0 +1,436 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import warnings
+import numpy as np
+import concurrent.futures as cf
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.linalg import expm
+
+def Explicit(K, dtype = None):
+    """
+    Explicit
+    Function to build the time-stepping operator of the explicit scheme.
+
+    Input:
+        K           m x m           Sparse          K Matrix with the computed Gammas.
+        dtype                       Type            Type of the operator, it is built in the type of K and then converted (Default: None, the type of K).
+
+    Output:
+        K2          m x m           Sparse          CSR matrix with the operator I + K.
+    """
+    m  = K.shape[0]                                                                 # The total number of nodes.
+    K2 = (sp.identity(m, format = 'csr') + K).tocsr()                               # Explicit formulation of K.
+    if dtype is not None:                                                           # If another type is requested.
+        K2 = K2.astype(dtype)
+    return K2
+
+def Implicit(K, lam = 0.5, dtype = None):
+    """
+    Implicit
+    Function to build the time-stepping operator of the implicit scheme.
+    The left-hand matrix I - (1-lam)K is factorized only once with a sparse LU decomposition, so each time step is one sparse product and one triangular solve.
+
+    Input:
+        K           m x m           Sparse          K Matrix with the computed Gammas.
+        lam                         Real            Lambda parameter for the implicit scheme.
+                                                        Must be between 0 and 1 (Default: 0.5).
+        dtype                       Type            Type of both matrices and of the factorization (Default: None, the type of K).
+
+    Output:
+        K2          m x m           Operator        Linear operator with the action of (I - (1-lam)K)^{-1}(I + lam K).
+                                                        The left-hand matrix and its factorization are kept on K2.A and K2.LU.
+    """
+    m  = K.shape[0]                                                                 # The total number of nodes.
+    I  = sp.identity(m, format = 'csr')                                             # Sparse identity matrix.
+    A  = (I - (1-lam)*K).tocsc()                                                    # Left-hand matrix.
+    B  = (I + lam*K).tocsr()                                                        # Right-hand matrix.
+    if dtype is not None:                                                           # If another type is requested.
+        A, B = A.astype(dtype), B.astype(dtype)
+    LU = spla.splu(A)                                                               # The left-hand matrix is factorized once.
+
+    def step(u):
+        return LU.solve(np.asarray(B@u, dtype = A.dtype))                           # One sparse product and one triangular solve.
+
+    K2 = spla.LinearOperator((m, m), matvec = step, matmat = step, dtype = A.dtype) # The factorization is reused on every time step.
+    K2.A, K2.LU = A, LU                                                             # Kept for the metrics of the operator (see Profile.Operator).
+    return K2
+
+def Stable(K1, lam = 1, method = 'auto', safety = 0.9, full = 4000, stats = None):
+    """
+    Stable
+    Function to estimate the largest stable time step of the scheme u^{k+1} = (I - (1-lam)dt K1)^{-1}(I + lam dt K1) u^k.
+    The scheme is stable if dt <= 2 Re(-mu)/((2 lam - 1)|mu|^2) for every eigenvalue mu of K1.
+    For lam <= 0.5 the scheme is unconditionally stable.
+    If K1 has eigenvalues with Re(mu) >= 0 (other than mu = 0), no time step is stable: a warning is issued and nan is returned.
+
+    Input:
+        K1          m x m           Sparse          K Matrix with the computed Gammas for dt = 1.
+        lam                         Real            Explicit weight of the scheme (1 for the explicit scheme, Default: 1).
+        method                      String          Estimate of the spectrum of K1.
+                                                        'auto': 'full' for m <= full, 'gershgorin' if its bound is valid, and 'arpack' otherwise (Default).
+                                                        'full': All the eigenvalues, with a dense matrix.
+                                                        'gershgorin': The Gershgorin discs, only a bound if all of them are on the left half-plane.
+                                                        'arpack': The eigenvalues of largest magnitude, real part and imaginary part, computed with ARPACK.
+                                                            It is an estimate, not a bound.
+        safety                      Real            Safety factor for the time step (Default: 0.9).
+        full                        Integer         Largest number of nodes for the 'full' method in 'auto' (Default: 4000).
+        stats                       Dictionary      Dictionary where the method used is stored as 'dt_method' (Default: None).
+
+    Output:
+        dt_max                      Real            Largest stable time step (inf if there is no limit, nan if there is no stable time step).
+    """
+    if lam <= 0.5:                                                                  # For unconditionally stable schemes.
+        method = 'unconditional'
+        dt     = np.inf
+    else:
+        K1 = sp.csr_matrix(K1)
+        m  = K1.shape[0]                                                            # The total number of nodes.
+        c  = K1.diagonal()                                                          # Centers of the Gershgorin discs.
+        r  = np.asarray(abs(K1).sum(axis = 1)).ravel() - np.abs(c)                  # Radii of the Gershgorin discs.
+        ok = np.all(r <= -c + 1e-12*np.abs(c).max())                                # All the discs are on the left half-plane.
+        if method == 'auto':                                                        # The method is chosen with the size of K1.
+            method = 'full' if m <= full else 'gershgorin' if ok else 'arpack'
+        if method == 'gershgorin':                                                  # For the Gershgorin bound.
+            if ok == False:                                                         # The discs do not bound the spectrum.
+                warnings.warn('The Gershgorin discs of K1 cross into the right half-plane, they do not bound the stable time step.')
+                dt = np.nan
+            else:
+                dt = 2/np.max(np.abs(c) + r)                                        # Limit for the disc that is farthest from 0.
+        else:                                                                       # For the eigenvalues.
+            if method == 'full':                                                    # All the eigenvalues.
+                mu = np.linalg.eigvals(K1.toarray())
+            elif method == 'arpack':                                                # Several parts of the spectrum.
+                mu = []
+                for which in ['LM', 'LR', 'LI']:
+                    try:
+                        mu.append(spla.eigs(K1, k = min(6, m - 2), which = which, tol = 1e-6, maxiter = 100*m, return_eigenvectors = False))
+                    except spla.ArpackNoConvergence as err:                         # The converged ones are kept.
+                        mu.append(err.eigenvalues)
+                mu = np.concatenate(mu)
+            else:
+                raise ValueError('Unknown method ' + str(method) + ', it must be auto, full, gershgorin or arpack.')
+            tol = 1e-10*np.abs(mu).max()                                            # Tolerance for the modes with mu = 0.
+            mu  = mu[np.abs(mu) > tol]                                              # Boundary nodes have mu = 0, they do not limit dt.
+            bad = mu.real >= -tol                                                   # Modes that grow for every dt.
+            if np.any(bad):                                                         # If there are unstable modes.
+                warnings.warn('K1 has ' + str(np.sum(bad)) + ' eigenvalues with Re(mu) >= 0 (max %.3e), no time step is stable.' % mu.real.max())
+                dt = np.nan
+            elif len(mu) == 0:                                                      # If there are no inner nodes.
+                dt = np.inf
+            else:
+                dt = np.min(2*(-mu.real)/np.abs(mu)**2)                             # Stability limit for each eigenvalue.
+        dt = dt/(2*lam - 1)
+    if stats is not None:                                                           # If the information is requested.
+        stats['dt_method'] = method                                                 # Method used for dt_max.
+    dt_max = safety*dt                                                              # Largest stable time step.
+    return dt_max
+
+def Exponential(K1, bnd, u, g, T, tol = 1e-8, q = 7):
+    """
+    Exponential
+    Generator with the solution of du/dt = K1 u on the inner nodes, advanced directly to each of the times in T.
+    The interior solution is computed with the action of the matrix exponential (see Expmv), so there is no time step.
+    The boundary data enters through a lifting term: on each time interval it is fitted with a polynomial in time (see Lifting), and the polynomial is included in an augmented system.
+
+    Input:
+        K1          m x m           Sparse          K Matrix with the computed Gammas for dt = 1.
+        bnd         m x 1           Logical         Array with the boundary nodes.
+        u           m x B           Array           Array with the initial condition of each case, at time T[0].
+        g                           Function        Function called as g(t) with an array of times, returning the b x B x s boundary data.
+        T           s x 1           Array           Array with the times to be computed, in increasing order.
+        tol                         Real            Tolerance for the exponential and for the boundary fitting (Default: 1e-8).
+        q                           Integer         Degree of the polynomial for the boundary data (Default: 7).
+
+    Output:
+        u           m x B           Array           Array with the solution of each case at each of the times in T.
+    """
+    bnd   = np.asarray(bnd, dtype = bool)                                           # Boundary nodes.
+    inner = np.where(bnd == False)[0]                                               # Inner nodes.
+    A     = sp.csr_matrix(K1)[inner, :]                                             # Rows of the inner nodes.
+    AII   = A[:, inner].tocsr()                                                     # Coupling between inner nodes.
+    AIB   = A[:, bnd].tocsr()                                                       # Coupling with the boundary nodes.
+    nA    = abs(AII).sum(axis = 0).max()                                            # 1-norm of AII.
+    u     = np.array(u, dtype = float)                                              # The solution is copied.
+    t0    = T[0]                                                                    # Current time.
+    yield u.copy()
+    for t1 in T[1:]:                                                                # For each of the times.
+        for ta, tb, a in Lifting(g, t0, t1, q, tol):                                # For each piece of the boundary data.
+            h  = tb - ta                                                            # Length of the piece.
+            fa = np.cumprod(np.hstack([1, np.arange(1, q+1)]))                      # Factorials.
+            for b in np.arange(u.shape[1]):                                         # For each of the cases.
+                W = h*(AIB@(a[:, b, ::-1]*fa[::-1]))                                # Lifting term, W = [b_q, ..., b_0].
+                x = np.hstack([u[inner, b], np.zeros(q), [1]])                      # Augmented vector [u; e_p].
+                u[inner, b] = Expmv(Augmented(h*AII, W), x, tol, h*nA + np.abs(W).sum(axis = 0).max() + 1)[:len(inner)]
+        u[bnd] = g(np.array([t1]))[..., 0]                                          # The boundary condition is assigned.
+        t0 = t1                                                                     # The time is updated.
+        yield u.copy()
+
+def Augmented(A, W):
+    """
+    Augmented
+    Function to build the action of the augmented matrix [[A, W], [0, J]], where J is the shift matrix with ones above the diagonal.
+    The exponential of the augmented matrix applied to [u; e_p] solves du/dt = A u + sum_j t^j/j! b_j, with W = [b_{p-1}, ..., b_0].
+
+    Input:
+        A           n x n           Sparse          Matrix of the system.
+        W           n x p           Array           Array with the vectors of the polynomial term.
+
+    Output:
+        Av                          Function        Function with the action of the augmented matrix.
+    """
+    n = A.shape[0]                                                                  # Size of the system.
+
+    def Av(x):
+        z = x[n:]                                                                   # Polynomial part of the vector.
+        return np.hstack([A@x[:n] + W@z, z[1:], [0]])                               # Action of the augmented matrix.
+    return Av
+
+def Expmv(Av, v, tol = 1e-8, anorm = 1, m = 30):
+    """
+    Expmv
+    Function to compute exp(A)v with a Krylov subspace method.
+    The interval [0, 1] is split in substeps whose length is chosen so that the estimated local error is below tol (Sidje, Expokit, 1998).
+
+    Input:
+        Av                          Function        Function with the action of the matrix A.
+        v           n x 1           Array           Array with the vector.
+        tol                         Real            Tolerance for the local error (Default: 1e-8).
+        anorm                       Real            Estimate of the norm of A (Default: 1).
+        m                           Integer         Dimension of the Krylov subspace (Default: 30).
+
+    Output:
+        w           n x 1           Array           Array with exp(A)v.
+    """
+    n     = len(v)                                                                  # Size of the system.
+    m     = min(m, n)                                                               # The subspace can not be larger than the system.
+    btol  = 1e-7                                                                    # Tolerance for happy breakdown.
+    gamma = 0.9                                                                     # Safety factor for the substeps.
+    delta = 1.2                                                                     # Local error is accepted if below delta*tol.
+    w     = np.array(v, dtype = float)                                              # Solution.
+    beta  = np.linalg.norm(w)                                                       # Norm of the solution.
+    if beta == 0:                                                                   # If the vector is null.
+        return w
+    xm    = 1/m
+    fact  = ((m+1)/np.exp(1))**(m+1)*np.sqrt(2*np.pi*(m+1))
+    t_new = (1/anorm)*((fact*tol)/(4*beta*anorm))**xm                               # First substep.
+    t_new = np.ceil(t_new/10**np.floor(np.log10(t_new) - 1))*10**np.floor(np.log10(t_new) - 1)
+    t_now = 0                                                                       # Current time.
+    while t_now < 1:                                                                # Until the end of the interval.
+        t_step = min(1 - t_now, t_new)                                              # Length of the substep.
+        V      = np.zeros([n, m+1])                                                 # Basis of the Krylov subspace.
+        H      = np.zeros([m+2, m+2])                                               # Hessenberg matrix.
+        V[:,0] = w/beta
+        k1     = 2                                                                  # Number of extra terms for the error estimate.
+        mb     = m                                                                  # Dimension actually used.
+        for j in np.arange(m):                                                      # Arnoldi process.
+            p  = Av(V[:,j])
+            hj = V[:, :j+1].T@p                                                     # Classical Gram-Schmidt.
+            p -= V[:, :j+1]@hj
+            hr = V[:, :j+1].T@p                                                     # Reorthogonalization.
+            p -= V[:, :j+1]@hr
+            H[:j+1,j] = hj + hr
+            s = np.linalg.norm(p)
+            if s < btol:                                                            # Happy breakdown, the subspace is invariant.
+                k1     = 0
+                mb     = j + 1
+                t_step = 1 - t_now
+                break
+            H[j+1,j] = s
+            V[:,j+1] = p/s
+        if k1 != 0:                                                                 # For the error estimate.
+            H[m+1,m] = 1
+            avnorm   = np.linalg.norm(Av(V[:,m]))
+        while True:                                                                 # Until the local error is small enough.
+            mx = mb + k1
+            F  = expm(t_step*H[:mx,:mx])                                            # Exponential of the small matrix.
+            if k1 == 0:                                                             # The result is exact.
+                err_loc = btol
+                break
+            phi1 = abs(beta*F[m,0])
+            phi2 = abs(beta*F[m+1,0]*avnorm)
+            if phi1 > 10*phi2:
+                err_loc = phi2
+            elif phi1 > phi2:
+                err_loc = phi1*phi2/(phi1 - phi2)
+            else:
+                err_loc = phi1
+            if err_loc <= delta*t_step*tol:                                         # The substep is accepted.
+                break
+            t_step = gamma*t_step*(t_step*tol/err_loc)**xm                          # The substep is reduced.
+            t_step = np.ceil(t_step/10**np.floor(np.log10(t_step) - 1))*10**np.floor(np.log10(t_step) - 1)
+        mx     = mb + max(0, k1 - 1)
+        w      = V[:, :mx]@(beta*F[:mx, 0])                                         # Solution at the end of the substep.
+        beta   = np.linalg.norm(w)
+        t_now  = t_now + t_step
+        t_new  = gamma*t_step*(t_step*tol/max(err_loc, 1e-300))**xm                 # Next substep.
+        t_new  = np.ceil(t_new/10**np.floor(np.log10(t_new) - 1))*10**np.floor(np.log10(t_new) - 1)
+        if beta == 0:                                                               # If the solution is null.
+            break
+    return w
+
+def Lifting(g, t0, t1, q = 7, tol = 1e-8):
+    """
+    Lifting
+    Function to fit the boundary data on [t0, t1] with polynomials of degree q in the normalized time tau = (t - ta)/(tb - ta).
+    The interval is halved until the fitted polynomial matches the boundary data up to tol.
+
+    Input:
+        g                           Function        Function called as g(t) with an array of times, returning the b x B x s boundary data.
+        t0                          Real            Start of the interval.
+        t1                          Real            End of the interval.
+        q                           Integer         Degree of the polynomial (Default: 7).
+        tol                         Real            Tolerance for the fitting, relative to the size of the data (Default: 1e-8).
+
+    Output:
+        pieces                      List            List of (ta, tb, a), with the coefficients a (b x B x q+1) of each power of tau.
+    """
+    tau  = (1 - np.cos(np.pi*(np.arange(q+1) + 0.5)/(q+1)))/2                       # Chebyshev points on [0, 1].
+    tat  = np.linspace(0, 1, 2*q + 1)                                               # Points to check the fitting.
+    Vi   = np.linalg.inv(np.vander(tau, q+1, increasing = True))                    # Inverse of the Vandermonde matrix.
+    Vt   = np.vander(tat, q+1, increasing = True)                                   # Vandermonde matrix on the check points.
+    todo = [(t0, t1, 0)]                                                            # Pieces to be fitted.
+    pieces = []
+    while len(todo) > 0:                                                            # For each of the pieces.
+        ta, tb, d = todo.pop(0)
+        a   = g(ta + (tb - ta)*tau)@Vi.T                                            # Coefficients of the polynomial.
+        gt  = g(ta + (tb - ta)*tat)                                                 # Boundary data on the check points.
+        err = np.max(np.abs(a@Vt.T - gt), initial = 0)                              # Error of the fitting.
+        if err <= tol*max(1, np.max(np.abs(gt), initial = 0)) or d >= 30:           # The fitting is accepted.
+            pieces.append((ta, tb, a))
+        else:                                                                       # The piece is halved.
+            tm = (ta + tb)/2
+            todo[0:0] = [(ta, tm, d+1), (tm, tb, d+1)]
+    return pieces
+
+def Fields(Gamma):
+    """
+    Fields
+    Function to store the Gammas of a logically rectangular mesh as nine weight fields for the matrix-free scheme.
+    Each field runs over the mesh nodes in row order, from node (1,1) to node (m-2,n-2), with zeros on the boundary nodes.
+
+    Input:
+        Gamma       m-2 x n-2 x 9   Array           Gammas of the central node and its neighbors (i-1,j-1), (i,j-1), (i+1,j-1), (i-1,j), (i+1,j), (i-1,j+1), (i,j+1), (i+1,j+1).
+
+    Output:
+        G           9 x (m-2)n-2    Array           The nine Gamma fields.
+    """
+    m    = len(Gamma[:,0,0]) + 2                                                    # The number of nodes in x.
+    n    = len(Gamma[0,:,0]) + 2                                                    # The number of nodes in y.
+    full = np.zeros([9, m, n])                                                      # Gamma fields on the whole mesh.
+    full[:, 1:m-1, 1:n-1] = np.moveaxis(Gamma, 2, 0)                                # Gammas of the inner nodes.
+    G    = full.reshape(9, m*n)[:, n+1:(m-1)*n-1].copy()                            # Fields from node (1,1) to node (m-2,n-2).
+    return G
+
+def Stencil(G, u, nb = 16384):
+    """
+    Stencil
+    Function to compute a new time level of the explicit scheme on a logically rectangular mesh without assembling K.
+    The nine Gamma fields are applied with shifted slices of the mesh, so there is no global matrix.
+    The mesh is processed in blocks of nb nodes to keep the partial sums in cache.
+
+    Input:
+        G           9 x (m-2)n-2    Array           The nine Gamma fields (see Fields).
+        u           m x n           Array           Array with the current time level.
+        nb                          Integer         Number of nodes on each block (Default: 16384).
+
+    Output:
+        un          m x n           Array           Array with the new time level, (I + K)u on the inner nodes. Boundary nodes keep their values.
+    """
+    m    = len(u[:,0])                                                              # The number of nodes in x.
+    n    = len(u[0,:])                                                              # The number of nodes in y.
+    lo   = n + 1                                                                    # Position of node (1,1).
+    hi   = (m-1)*n - 1                                                              # Position after node (m-2,n-2).
+    offs = [0, -n-1, -1, n-1, -n, n, -n+1, 1, n+1]                                  # Position of each neighbor relative to the central node.
+    ext  = (1,)*(u.ndim - 2)                                                        # Extra dimensions of u, if any.
+    uf   = np.ascontiguousarray(u).reshape((m*n,) + u.shape[2:])                    # The mesh in row order.
+    un   = uf.copy()                                                                # The identity part of the scheme.
+    tmp  = np.empty((nb,) + u.shape[2:], dtype = un.dtype)                          # Temporal array for the products.
+    for a in np.arange(lo, hi, nb):                                                 # For each block of nodes.
+        b    = min(a + nb, hi)                                                      # End of the block.
+        core = un[a:b]                                                              # View of the block.
+        t    = tmp[:b-a]                                                            # Temporal array of the block.
+        for k in np.arange(9):                                                      # For each of the Gammas.
+            g = G[k, a-lo:b-lo].reshape((b-a,) + ext)                               # Gamma field on the block.
+            np.multiply(g, uf[a+offs[k]:b+offs[k]], out = t)                        # Gamma times the shifted solution.
+            core += t                                                               # The contribution is added.
+    return un.reshape(u.shape)
+
+_pool    = None                                                                     # Threads shared by all the threaded steps.
+_workers = 0                                                                        # Number of threads of the pool.
+
+def Pool(workers):
+    """
+    Pool
+    Function to get the pool of threads used by the threaded steps.
+    The pool is kept between time steps and between runs, and it is only created again if another number of threads is requested.
+
+    Input:
+        workers                     Integer         Number of threads.
+
+    Output:
+        pool                        Executor        Pool of threads.
+    """
+    global _pool, _workers
+    if _pool is None or _workers != workers:                                        # If there is no pool with those threads.
+        if _pool is not None:
+            _pool.shutdown()
+        _pool    = cf.ThreadPoolExecutor(max_workers = workers)
+        _workers = workers
+    return _pool
+
+def Blocks(K2, bnd, workers):
+    """
+    Blocks
+    Function to build an explicit time step that applies the operator by blocks of rows on several threads.
+    The rows are split in blocks with the same number of entries, one for each thread.
+    Each block computes its part of K2 u and assigns the boundary conditions of its own nodes, so there is no serial pass over the boundary.
+    The sparse products release the GIL, so the blocks run at the same time.
+
+    Input:
+        K2          m x m           Sparse          CSR matrix with the explicit operator (see Explicit).
+        bnd         nb x 1          Array           Array with the indexes of the boundary nodes, in the order of the boundary conditions.
+        workers                     Integer         Number of threads.
+
+    Output:
+        step                        Function        Function called as step(u, g), with the new time level K2 u and the values g on the boundary nodes.
+                                                        u is m x 1 or m x B, and g is nb x 1 or nb x B.
+    """
+    K2   = sp.csr_matrix(K2)
+    m    = K2.shape[0]                                                              # The total number of nodes.
+    nnz  = np.linspace(0, K2.nnz, workers + 1)                                      # The entries are split in equal parts.
+    cut  = np.unique(np.r_[0, np.searchsorted(K2.indptr, nnz[1:-1]), m])            # First row of each block.
+    srt  = np.argsort(bnd, kind = 'stable')                                         # The boundary nodes sorted by index.
+    bs   = np.asarray(bnd)[srt]
+    ib   = np.searchsorted(bs, cut)                                                 # First boundary node of each block.
+    blks = [(a, b, K2[a:b], bs[c:d], srt[c:d]) for a, b, c, d in zip(cut[:-1], cut[1:], ib[:-1], ib[1:])]
+    pool = Pool(workers)
+
+    def block(blk, u, g, un):
+        a, b, Kb, bi, gi = blk
+        un[a:b] = Kb@u                                                              # New time level of the rows.
+        un[bi]  = g[gi]                                                             # Boundary conditions of the rows.
+
+    def step(u, g):
+        un = np.empty_like(u)                                                       # New time level.
+        for fut in [pool.submit(block, blk, u, g, un) for blk in blks]:             # All the blocks at the same time.
+            fut.result()                                                            # Errors on the threads are raised here.
+        return un
+
+    return step
@@ -0,0 +1,154 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import os
+import json
+import numpy as np
+
+def Writer(path, steps = None, chunk = 256, exact = None, **arrays):
+    """
+    Writer
+    Function to create a solution store, written while the solver runs.
+    The solution is stored in time-chunked .npy files that are filled through memory maps, so the whole history is never kept in memory.
+    The theoretical solution is not stored, only its description on exact.
+
+    Input:
+        path                        String          Folder of the store.
+        steps                       Array           Time steps to be stored (Default: None, all of them).
+        chunk                       Integer         Number of time levels on each file (Default: 256).
+        exact                       Dictionary      Description of the theoretical solution (for example, its name and v).
+        arrays                      Arrays          Other arrays to be stored with the solution (for example, p and tt).
+
+    Output:
+        callback                    Function        Function called as callback(k, T[k], u) by the solvers.
+        close                       Function        Function to finish the store, it must be called after the solver.
+    """
+    os.makedirs(path, exist_ok = True)                                              # The folder is created if needed.
+    for name, a in arrays.items():                                                  # Other arrays.
+        np.save(os.path.join(path, name + '.npy'), np.asarray(a))
+    steps = None if steps is None else set(int(k) for k in steps)                   # Time steps to be stored.
+    index = {'chunk': chunk, 'files': [], 'counts': [], 'steps': [], 'times': [], 'exact': exact, 'arrays': sorted(arrays)}
+    state = {'mm': None, 'c': 0}                                                    # Current memory map and its number of levels.
+
+    def callback(k, tk, u):
+        if steps is not None and int(k) not in steps:                               # If the time level is not requested.
+            return
+        if state['mm'] is None:                                                     # A new file is needed.
+            fil = 'u_%05d.npy' % len(index['files'])
+            state['mm'] = np.lib.format.open_memmap(os.path.join(path, fil), mode = 'w+', dtype = np.asarray(u).dtype, shape = (chunk,) + np.shape(u))
+            state['c']  = 0
+            index['files'].append(fil)
+            index['counts'].append(0)
+            index['shape'] = list(np.shape(u))
+            index['dtype'] = np.asarray(u).dtype.str
+        state['mm'][state['c']] = u                                                 # The time level is written.
+        state['c'] += 1
+        index['counts'][-1] = state['c']
+        index['steps'].append(int(k))
+        index['times'].append(float(tk))
+        if state['c'] == chunk:                                                     # The file is full.
+            state['mm'].flush()
+            state['mm'] = None
+
+    def close():
+        if state['mm'] is not None:                                                 # The last file is partially filled.
+            mm  = state['mm']
+            fil = os.path.join(path, index['files'][-1])
+            part = np.array(mm[:state['c']])                                        # The valid time levels.
+            del mm
+            state['mm'] = None
+            np.save(fil, part)                                                      # The file is rewritten with its actual size.
+        with open(os.path.join(path, 'index.json'), 'w') as fil:                    # The index is written.
+            json.dump(index, fil, indent = 1)
+
+    return callback, close
+
+def Index(path):
+    """
+    Index
+    Function to read the index of a solution store.
+
+    Input:
+        path                        String          Folder of the store.
+
+    Output:
+        index                       Dictionary      Index with the files, time steps, times and the description of the theoretical solution.
+    """
+    with open(os.path.join(path, 'index.json')) as fil:
+        index = json.load(fil)
+    return index
+
+def Read(path, nodes = slice(None), t0 = None, t1 = None):
+    """
+    Read
+    Function to read part of a solution store. Only the files with times between t0 and t1 are opened, as memory maps.
+
+    Input:
+        path                        String          Folder of the store.
+        nodes                       Various         Index of the nodes to be read, as for a numpy array (Default: all of them).
+        t0                          Real            Initial time to be read (Default: the first time).
+        t1                          Real            Final time to be read (Default: the last time).
+
+    Output:
+        T           s x 1           Array           Array with the times that were read.
+        u           s x ...         Array           Array with the solution on the requested nodes at each of the times.
+    """
+    index = Index(path)                                                             # Index of the store.
+    times = np.array(index['times'])                                                # Stored times.
+    t0    = -np.inf if t0 is None else t0
+    t1    = np.inf if t1 is None else t1
+    ks    = np.where((times >= t0) & (times <= t1))[0]                              # Stored levels in the time range.
+    parts = []
+    start = 0                                                                       # First level of each file.
+    for fil, c in zip(index['files'], index['counts']):                             # For each of the files.
+        sel = ks[(ks >= start) & (ks < start + c)] - start                          # Requested levels on the file.
+        if len(sel) > 0:
+            mm = np.load(os.path.join(path, fil), mmap_mode = 'r')
+            parts.append(np.asarray(mm[sel[0]:sel[-1]+1][(slice(None),) + np.index_exp[nodes]]))
+        start += c
+    shape = np.zeros(index.get('shape', [0]))[np.index_exp[nodes]].shape             # Shape of the requested nodes.
+    u     = np.concatenate(parts) if len(parts) > 0 else np.zeros((0,) + shape)
+    return times[ks], u
+
+def Exact(path, f, x, y, nodes = slice(None), t0 = None, t1 = None):
+    """
+    Exact
+    Function to evaluate the theoretical solution on the times of a solution store, with the v stored on its description.
+
+    Input:
+        path                        String          Folder of the store.
+        f                           Function        Function with the theoretical solution, f(x, y, t, v).
+        x           m x 1           Array           Array with the coordinates in x of the nodes (or m x n for meshes).
+        y           m x 1           Array           Array with the coordinates in y of the nodes (or m x n for meshes).
+        nodes                       Various         Index of the nodes, as for a numpy array (Default: all of them).
+        t0                          Real            Initial time (Default: the first time).
+        t1                          Real            Final time (Default: the last time).
+
+    Output:
+        T           s x 1           Array           Array with the times.
+        u_ex        s x ...         Array           Array with the theoretical solution on the requested nodes at each of the times.
+    """
+    index = Index(path)                                                             # Index of the store.
+    times = np.array(index['times'])                                                # Stored times.
+    t0    = -np.inf if t0 is None else t0
+    t1    = np.inf if t1 is None else t1
+    T     = times[(times >= t0) & (times <= t1)]                                    # Times in the time range.
+    xs    = np.asarray(x)[np.index_exp[nodes]]                                      # Coordinates of the requested nodes.
+    ys    = np.asarray(y)[np.index_exp[nodes]]
+    u_ex  = np.zeros((len(T),) + xs.shape) + f(xs[np.newaxis], ys[np.newaxis], T.reshape((-1,) + (1,)*xs.ndim), index['exact']['v'])
+    return T, u_ex
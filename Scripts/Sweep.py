@@ -0,0 +1,378 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+"""
+
+import os
+import json
+import time
+import signal
+import traceback
+import multiprocessing as mp
+import multiprocessing.connection
+import numpy as np
+import Scripts.Errors as Errors
+import Scripts.Cache as Cache
+import Scripts.Store as Store
+import Scripts.Catalog as Catalog
+import Diffusion_2D
+
+# Diffusion coefficient
+v = 0.2
+
+# Names of the regions
+regions = ['CAB','CUA','CUI','DOW','ENG','GIB','HAB','MIC','PAT','ZIR']
+
+# Sizes of the discretizations
+sizes = ['1', '2', '3']
+
+# Discretizations and the folder with their data
+discretizations = {'Clouds': 'Clouds', 'Triangulations': 'Clouds', 'Meshes': 'Meshes', 'Holes': 'Holes'}
+
+# Schemes
+schemes = ['Explicit', 'Implicit']
+
+# Boundary conditions
+# The boundary conditions are defined as
+#   f = e^{-2*\pi^2vt}\cos(\pi x)cos(\pi y)
+
+def fDIF(x, y, t, v):
+    fun = np.exp(-2*np.pi**2*v*t)*np.cos(np.pi*x)*np.cos(np.pi*y)
+    return fun
+
+def Steps(size):
+    """
+    Steps
+    Function with the number of time steps used for each size of the discretizations.
+
+    Input:
+        size                        String          Size of the discretization.
+
+    Output:
+        t                           Integer         Number of time steps.
+    """
+    t = {'1': 1000, '2': 4000, '3': 16000}.get(size, 32000)                         # Number of time steps.
+    return t
+
+def Load(disc, reg, size):
+    """
+    Load
+    Function to load the geometry of a case.
+
+    Input:
+        disc                        String          Discretization ('Clouds', 'Triangulations', 'Meshes' or 'Holes').
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+
+    Output:
+        geo                         Dictionary      Dictionary with p and tt (0-based) for clouds, or x and y for meshes.
+    """
+    geo = Catalog.Load(discretizations[disc], reg, size)                            # Memory-mapped from the store, if imported.
+    return geo
+
+def Cost(disc, reg, size, scheme):
+    """
+    Cost
+    Function to estimate the relative cost of a case, used to run the largest cases first.
+
+    Input:
+        disc                        String          Discretization.
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        scheme                      String          Scheme ('Explicit' or 'Implicit').
+
+    Output:
+        cost                        Real            Estimated cost of the case.
+    """
+    m    = Catalog.Nodes(discretizations[disc], reg, size)                          # The total number of nodes.
+    cost = m*Steps(size)*(3 if scheme == 'Implicit' else 1)                         # Nodes times steps, an implicit step is about 3 explicit ones.
+    return cost
+
+def Label(disc, reg, size):
+    """
+    Label
+    Function with the size label used on the summaries (the number of nodes in x for meshes).
+
+    Input:
+        disc                        String          Discretization.
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+
+    Output:
+        label                       String          Label of the size.
+    """
+    if disc == 'Meshes':                                                            # For logically rectangular meshes.
+        return str(len(Load(disc, reg, size)['x'][:,0]))
+    return size
+
+def Case(disc, reg, size, scheme, graphs = True, preview = False, stats = None):
+    """
+    Case
+    Function to solve a single case and to save its results on the Results folder.
+
+    Input:
+        disc                        String          Discretization ('Clouds', 'Triangulations', 'Meshes' or 'Holes').
+        reg                         String          Name of the region.
+        size                        String          Size of the discretization.
+        scheme                      String          Scheme ('Explicit' or 'Implicit').
+        graphs                      Logical         Select whether or not the graphs and videos are saved (Default: True).
+        preview                     Logical         Select whether or not the graphs and videos are drawn with the fast 2D preview (Default: False).
+        stats                       Dictionary      Dictionary filled with the information about the run (see Diffusion_2D.Cloud).
+
+    Output:
+        er                          Real            Maximum of the mean square error over time.
+    """
+    geo      = Load(disc, reg, size)                                                # Geometry of the case.
+    t        = Steps(size)                                                          # Number of time steps.
+    implicit = scheme == 'Implicit'                                                 # Select the scheme.
+    fol      = 'Results/' + disc + '/' + scheme + '/'                               # Folder for the results.
+    nam      = reg + '_' + size                                                     # Name of the case.
+    for sub in ([''] + (['QME/', 'Steps/', 'Videos/'] if graphs == True else [])):
+        os.makedirs(fol + sub, exist_ok = True)                                     # The folders are created if needed.
+
+    save     = int(np.ceil(t/50)) if graphs == True else []                         # Only the frames of the videos are kept, and only for the graphs.
+
+    if disc == 'Meshes':                                                            # For logically rectangular meshes.
+        x, y       = geo['x'], geo['y']
+        cb, er     = Errors.Mesh_Stream(x, y, fDIF, v, t)                           # The error is computed while solving.
+        u_ap, u_ex = Diffusion_2D.Mesh(x, y, fDIF, v, t, implicit = implicit, save = save, callback = cb, cache = True, stats = stats)
+    else:                                                                           # For clouds of points, triangulations and clouds with holes.
+        p, tt      = geo['p'], geo['tt']
+        tri        = disc == 'Triangulations'                                       # Select the neighbor search.
+        hol        = disc == 'Holes'                                                # Never across a hole.
+        L          = np.vstack([[0], [0], [2*v], [0], [2*v]])                       # The differential operator of the solver, for the same cache entry.
+        vec, _     = Cache.Cloud(p, tt, 8, L, tri, hol)                             # The neighbors are found once, the solver reads them from the cache.
+        cb, er     = Errors.Cloud_Stream(p, vec, fDIF, v, t)                        # The error is computed while solving.
+        close      = None
+        if disc in ['Clouds', 'Holes']:                                             # The solutions on the clouds are saved while solving.
+            cs, close = Store.Writer(fol + nam, exact = {'name': 'fDIF', 'v': v}, p = p, tt = tt)
+            cb        = Chain(cb, cs)
+        try:
+            u_ap, u_ex, vec = Diffusion_2D.Cloud(p, fDIF, v, t, implicit = implicit, triangulation = tri, tt = tt, lam = 0.5, save = save, callback = cb, cache = True, stats = stats, holes = hol)
+        finally:
+            if close is not None:                                                   # The store is readable even if the solver stopped.
+                close()
+
+    if graphs == True:                                                              # If the graphs are requested.
+        import Scripts.Graph as Graph
+        T = np.linspace(0,1,t)                                                      # Time discretization.
+        T = T[Diffusion_2D.Schedule(T, save)]                                       # Times of the stored snapshots.
+        Graph.Error_sav(er, fol + 'QME/' + nam + '.png')
+        if disc == 'Meshes':                                                        # One process per video, the sweep already uses all the CPUs.
+            Graph.Mesh_Transient_sav(x, y, u_ap, u_ex, fol + 'Videos/' + nam + '.mp4', T, workers = 1, preview = preview)
+            Graph.Mesh_Static_sav(x, y, u_ap, u_ex, fol + 'Steps/' + nam + '_', T, preview = preview)
+        else:
+            Graph.Cloud_Transient_sav(p, tt, u_ap, u_ex, fol + 'Videos/' + nam + '.mp4', T, workers = 1, preview = preview)
+            Graph.Cloud_Static_sav(p, tt, u_ap, u_ex, fol + 'Steps/' + nam + '_', T, preview = preview)
+    return er.max()
+
+def Chain(*callbacks):
+    """
+    Chain
+    Function to pass each time level to several callback functions.
+
+    Input:
+        callbacks                   Functions       Functions called as callback(k, T[k], u).
+
+    Output:
+        callback                    Function        Function that calls all of them.
+    """
+    def callback(k, tk, u):
+        for cb in callbacks:
+            cb(k, tk, u)
+    return callback
+
+def Stop(signum, frame):
+    """
+    Stop
+    Handler of SIGTERM on the processes of the sweep, it stops the case with SystemExit so the open stores are closed.
+    """
+    raise SystemExit(1)
+
+def Worker(case, graphs, preview, conn):
+    """
+    Worker
+    Function executed by each process of the sweep.
+
+    Input:
+        case                        Tuple           (disc, reg, size, scheme) of the case.
+        graphs                      Logical         Select whether or not the graphs and videos are saved.
+        preview                     Logical         Select whether or not the graphs and videos are drawn with the fast 2D preview.
+        conn                        Connection      End of the pipe of the case where (er, stats) is sent; er is None if the case failed.
+    """
+    signal.signal(signal.SIGTERM, Stop)                                             # A timeout still runs the finally blocks of the case.
+    stats = {}                                                                      # Information about the run.
+    try:
+        er = float(Case(*case, graphs, preview, stats))                             # The case is solved.
+    except Exception:                                                               # If the case failed.
+        traceback.print_exc()
+        er = None
+    conn.send((er, stats))
+    conn.close()
+
+def Run(cases, workers = None, timeout = None, graphs = True, preview = False, stats = None):
+    """
+    Run
+    Function to solve several cases on a pool of processes.
+    The cases are started from the most expensive to the cheapest one (see Cost), and each case is stopped if it runs longer than timeout.
+    Each case sends its result through its own pipe, so stopping a case never touches the results of the others.
+
+    Input:
+        cases                       List            List of (disc, reg, size, scheme) cases.
+        workers                     Integer         Number of processes (Default: the number of CPUs).
+        timeout                     Real            Maximum time in seconds for each case (Default: None, no limit).
+        graphs                      Logical         Select whether or not the graphs and videos are saved (Default: True).
+        preview                     Logical         Select whether or not the graphs and videos are drawn with the fast 2D preview (Default: False).
+        stats                       Dictionary      Dictionary filled with the information about the run of each finished case (Default: None).
+
+    Output:
+        ers                         Dictionary      Dictionary with the error of each case; None if the case failed or timed out.
+    """
+    workers = workers or os.cpu_count() or 1                                        # Number of processes.
+    pending = sorted(cases, key = lambda c: Cost(*c), reverse = True)               # The largest cases first.
+    running = {}                                                                    # Running cases, with their process, pipe and start time.
+    ers     = {}                                                                    # Errors of the finished cases.
+
+    while len(pending) > 0 or len(running) > 0:                                     # Until all the cases are done.
+        while len(pending) > 0 and len(running) < workers:                          # Start new cases while there are free workers.
+            case       = pending.pop(0)
+            recv, send = mp.Pipe(duplex = False)                                    # Pipe for the result of the case.
+            proc       = mp.Process(target = Worker, args = (case, graphs, preview, send))
+            proc.start()
+            send.close()                                                            # Only the worker writes on the pipe.
+            running[case] = (proc, recv, time.time())
+        waits = [w for proc, recv, t0 in running.values() for w in (recv, proc.sentinel)]
+        mp.connection.wait(waits, timeout = 0.5)                                    # Wait for a result or for the end of a process.
+        for case, (proc, recv, t0) in list(running.items()):                        # Check the running cases.
+            if recv.poll() == True:                                                 # If the case sent something.
+                try:
+                    er, st = recv.recv()
+                except (EOFError, OSError):                                         # The process died without a result.
+                    er, st = None, None
+                ers[case] = er
+                if stats is not None and er is not None:
+                    stats[case] = st
+                Report(case, er)
+            elif timeout is not None and time.time() - t0 > timeout:                # If the case is too long.
+                proc.terminate()
+                ers[case] = None
+                Report(case, None, 'timeout after ' + str(timeout) + ' s')
+            elif proc.exitcode is not None and recv.poll() == False:                # If the process ended without a result.
+                ers[case] = None
+                Report(case, None)
+            else:                                                                   # The case is still running.
+                continue
+            proc.join()
+            recv.close()
+            running.pop(case)
+    return ers
+
+def Report(case, er, reason = 'failed'):
+    """
+    Report
+    Function to print the error of a case, in the same way as the run_*.py scripts, with the discretization in front.
+
+    Input:
+        case                        Tuple           (disc, reg, size, scheme) of the case.
+        er                          Real            Maximum of the mean square error over time (None if the case did not finish).
+        reason                      String          Text printed instead of the error when the case did not finish (Default: 'failed').
+    """
+    disc, reg, size, scheme = case
+    print(disc, reg, 'size', size, '.', scheme, 'scheme: ', er if er is not None else reason)
+
+def Summary(ers, stats = None):
+    """
+    Summary
+    Function to write the Results_*.txt summaries with the errors of the cases, and the Stats_*.json files with the information about their runs.
+    The new errors are merged with the ones already on each summary, so a partial sweep does not remove the other cases.
+
+    Input:
+        ers                         Dictionary      Dictionary with the error of each (disc, reg, size, scheme) case.
+        stats                       Dictionary      Dictionary with the information about the run of each case (Default: None).
+    """
+    groups = {}                                                                     # Cases for each summary.
+    for (disc, reg, size, scheme), er in ers.items():
+        if er is not None:                                                          # Only the cases that finished.
+            groups.setdefault((disc, scheme), {})[(reg, Label(disc, reg, size))] = er
+
+    for (disc, scheme), new in groups.items():                                      # For each summary.
+        nom = 'Results/' + disc + '/' + scheme + '/Results_' + disc + '.txt'        # Name of the summary.
+        old = {}                                                                    # Errors already on the summary.
+        if os.path.exists(nom):
+            with open(nom) as fil:
+                for line in fil:
+                    w = line.split()
+                    if len(w) == 7:                                                 # "REG size S . Scheme scheme:  er"
+                        old[(w[0], w[2])] = w[6]
+        for key, er in new.items():
+            old[key] = '%.16e' % er
+        blocks = []
+        order  = {r: i for i, r in enumerate(regions)}
+        for reg in sorted({k[0] for k in old}, key = lambda r: (order.get(r, len(order)), r)):
+            keys = sorted([k for k in old if k[0] == reg], key = lambda k: int(k[1]))
+            blocks.append('\n'.join(reg + ' size ' + k[1] + ' . ' + scheme + ' scheme:  ' + old[k] for k in keys))
+        with open(nom, 'w') as fil:
+            fil.write('\n\n'.join(blocks))
+    if stats is not None:
+        Stats(stats)
+
+def Stats(stats):
+    """
+    Stats
+    Function to write the Stats_*.json files, next to the Results_*.txt summaries, with the information about the run of each case.
+    The new cases are merged with the ones already on each file.
+
+    Input:
+        stats                       Dictionary      Dictionary with the information about the run of each (disc, reg, size, scheme) case.
+    """
+    groups = {}                                                                     # Cases for each file.
+    for (disc, reg, size, scheme), st in stats.items():
+        groups.setdefault((disc, scheme), {})[reg + ' size ' + Label(disc, reg, size)] = st
+
+    for (disc, scheme), new in groups.items():                                      # For each file.
+        nom = 'Results/' + disc + '/' + scheme + '/Stats_' + disc + '.json'         # Name of the file.
+        old = {}                                                                    # Cases already on the file.
+        if os.path.exists(nom):
+            with open(nom) as fil:
+                old = json.load(fil, parse_constant = lambda c: None)               # NaN and Infinity of older files are read as None.
+        old.update(new)
+        with open(nom, 'w') as fil:
+            json.dump(old, fil, indent = 1, sort_keys = True, allow_nan = False)    # Strict JSON.
+
+def Sweep(discs = None, regs = None, sizs = None, schs = None, workers = None, timeout = None, graphs = True, preview = False):
+    """
+    Sweep
+    Function to solve all the combinations of discretizations, regions, sizes and schemes, and to write their summaries.
+
+    Input:
+        discs                       List            Discretizations (Default: all of them).
+        regs                        List            Regions (Default: all of them).
+        sizs                        List            Sizes (Default: all of them).
+        schs                        List            Schemes (Default: both of them).
+        workers                     Integer         Number of processes (Default: the number of CPUs).
+        timeout                     Real            Maximum time in seconds for each case (Default: None, no limit).
+        graphs                      Logical         Select whether or not the graphs and videos are saved (Default: True).
+        preview                     Logical         Select whether or not the graphs and videos are drawn with the fast 2D preview (Default: False).
+
+    Output:
+        ers                         Dictionary      Dictionary with the error of each case.
+    """
+    cases = [(d, r, s, c) for d in (discs or list(discretizations)) for c in (schs or schemes) \
+                          for r in (regs or regions) for s in (sizs or sizes)]      # All the cases.
+    sts   = {}                                                                      # Information about the run of each case.
+    ers   = Run(cases, workers, timeout, graphs, preview, sts)                      # The cases are solved.
+    Summary(ers, sts)                                                               # The summaries are written.
+    return ers
@@ -0,0 +1,57 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+
+Usage:
+    python run_benchmark.py -f Clouds Holes -r CAB -s 1 2 --steps 200 --repeat 3
+    python run_benchmark.py --save-baseline
+    python run_benchmark.py -f Meshes -s 3 --no-render --precision
+"""
+
+import sys
+import argparse
+import Scripts.Sweep as Sweep
+import Scripts.Benchmark as Benchmark
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Measure the time and memory of each stage on the bundled geometries.')
+    parser.add_argument('-f', '--folders', nargs = '+', choices = Benchmark.folders, help = 'Folders of the geometries (Default: all).')
+    parser.add_argument('-r', '--regions', nargs = '+', choices = Sweep.regions, help = 'Regions (Default: all).')
+    parser.add_argument('-s', '--sizes', nargs = '+', help = 'Sizes (Default: 1 2 3).')
+    parser.add_argument('--steps', type = int, default = 100, help = 'Time steps used for the step cost and the error (Default: 100).')
+    parser.add_argument('--repeat', type = int, default = 1, help = 'Runs for the time of each stage, the best one is kept (Default: 1).')
+    parser.add_argument('--no-render', action = 'store_true', help = 'Do not measure the rendering.')
+    parser.add_argument('--precision', action = 'store_true', help = 'Compare the single and double precision time steps.')
+    parser.add_argument('-o', '--output', default = Benchmark.output, help = 'File with the results (Default: %(default)s).')
+    parser.add_argument('-b', '--baseline', default = Benchmark.baseline, help = 'File with the baseline (Default: %(default)s).')
+    parser.add_argument('--save-baseline', action = 'store_true', help = 'Write the results as the new baseline.')
+    parser.add_argument('--tolerance', type = float, default = 0.25, help = 'Relative growth flagged as a regression (Default: 0.25).')
+    args = parser.parse_args()
+
+    bench = Benchmark.Run(args.folders, args.regions, args.sizes, args.steps, args.repeat, args.no_render == False, args.precision)
+    Benchmark.Save(bench, args.output)
+    if args.save_baseline == True:                                                  # The results are the new baseline.
+        Benchmark.Save(bench, args.baseline)
+        sys.exit(0)
+
+    base = Benchmark.Load(args.baseline)
+    if base is None:                                                                # There is nothing to compare with.
+        print('No baseline on', args.baseline)
+        sys.exit(0)
+    reg = Benchmark.Compare(bench, base, args.tolerance)
+    for key, stage, metric, a, b in reg:
+        print('Regression on', key, stage, metric + ':', '%.3e' % a, '->', '%.3e' % b)
+    sys.exit(1 if len(reg) > 0 else 0)
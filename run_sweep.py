@@ -0,0 +1,37 @@
+"""
+All the codes presented below were developed by:
+    Dr. Gerardo Tinoco Guerrero
+    Universidad Michoacana de San Nicolás de Hidalgo
+    gerardo.tinoco@umich.mx
+
+With the funding of:
+    National Council of Science and Technology, CONACyT (Consejo Nacional de Ciencia y Tecnología, CONACyT). México.
+    Coordination of Scientific Research, CIC-UMSNH (Coordinación de la Investigación Científica de la Universidad Michoacana de San Nicolás de Hidalgo, CIC-UMSNH). México
+    Aula CIMNE-Morelia. México
+
+Date:
+    October, 2026.
+
+Last Modification:
+    October, 2026.
+
+Usage:
+    python run_sweep.py -d Clouds Meshes -r CAB ZIR -s 1 2 -c Implicit -w 4 --timeout 3600 --preview
+"""
+
+import argparse
+import Scripts.Sweep as Sweep
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Solve the Diffusion equation on several regions in parallel.')
+    parser.add_argument('-d', '--discretizations', nargs = '+', choices = list(Sweep.discretizations), help = 'Discretizations (Default: all).')
+    parser.add_argument('-r', '--regions', nargs = '+', choices = Sweep.regions, help = 'Regions (Default: all).')
+    parser.add_argument('-s', '--sizes', nargs = '+', help = 'Sizes (Default: 1 2 3).')
+    parser.add_argument('-c', '--schemes', nargs = '+', choices = Sweep.schemes, help = 'Schemes (Default: both).')
+    parser.add_argument('-w', '--workers', type = int, help = 'Number of processes (Default: the number of CPUs).')
+    parser.add_argument('--timeout', type = float, help = 'Maximum time in seconds for each case (Default: no limit).')
+    parser.add_argument('--no-graphs', action = 'store_true', help = 'Do not save the graphs and videos.')
+    parser.add_argument('--preview', action = 'store_true', help = 'Draw the graphs and videos with the fast 2D preview.')
+    args = parser.parse_args()
+
+    Sweep.Sweep(args.discretizations, args.regions, args.sizes, args.schemes, args.workers, args.timeout, args.no_graphs == False, args.preview)
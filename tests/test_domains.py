@@ -0,0 +1,45 @@
+"""
+Tests of the domain-decomposed solver (Scripts/Domains.py).
+They must be run from the root of the repository, where the Data folder is.
+"""
+
+import os
+import sys
+import signal
+import threading
+import multiprocessing as mp
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Diffusion_2D
+import Scripts.Catalog as Catalog
+import Scripts.Sweep as Sweep
+import Scripts.Domains as Domains
+
+@pytest.fixture
+def cloud(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return np.array(Catalog.Load('Clouds', 'CAB', '1')['p'])
+
+@pytest.mark.parametrize('save', [None, 10, []])
+def test_same_as_serial(cloud, save):
+    t = 50
+    u_ap, u_ex, vec = Diffusion_2D.Cloud(cloud, Sweep.fDIF, Sweep.v, t, save = save)
+    d_ap, d_ex, dvec = Domains.Cloud(cloud, Sweep.fDIF, Sweep.v, t, 3, save = save)
+    assert d_ap.shape == u_ap.shape
+    assert np.array_equal(d_ap, u_ap)
+    assert np.array_equal(d_ex, u_ex)
+    assert np.array_equal(dvec, vec)
+
+def test_killed_worker(cloud):
+    def kill():
+        while True:                                                                 # Until the workers are running.
+            procs = mp.active_children()
+            if len(procs) > 0:
+                os.kill(procs[0].pid, signal.SIGKILL)
+                return
+    threading.Thread(target = kill, daemon = True).start()
+    with pytest.raises(RuntimeError):
+        Domains.Cloud(cloud, Sweep.fDIF, Sweep.v, 200000, 2, save = [1])